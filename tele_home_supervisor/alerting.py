@@ -7,7 +7,6 @@ import html
 import logging
 import os
 import re
-import shutil
 import time
 from dataclasses import dataclass
 
@@ -242,7 +241,7 @@ def _parse_temp_value(raw: str) -> float | None:
 
 
 async def _ping_once(host: str) -> bool:
-    ping_bin = shutil.which("ping") or "/bin/ping"
+    ping_bin = cli.cached_which("ping") or "/bin/ping"
     rc, _, _ = await cli.run_cmd([ping_bin, "-c", "1", "-W", "2", host], timeout=4)
     return rc == 0
 
@@ -1,6 +1,6 @@
 """Helper utilities for running subprocess/CLI commands.
 
-Provides an async `run_cmd` wrapper and `get_docker_cmd`.
+Provides an async `run_cmd` wrapper, `cached_which` and `get_docker_cmd`.
 """
 
 from __future__ import annotations
@@ -9,18 +9,27 @@ import asyncio
 import logging
 import os
 import shutil
+import time
+from functools import cache
 
 logger = logging.getLogger(__name__)
 
 
 async def run_cmd(
-    cmd: list[str], timeout: int = 10, env: dict[str, str] | None = None
+    cmd: list[str],
+    timeout: int = 10,
+    env: dict[str, str] | None = None,
+    limiter: asyncio.Semaphore | None = None,
 ) -> tuple[int, str, str]:
     """Run a command asynchronously and return (returncode, stdout, stderr).
 
     Args:
         cmd: Command and arguments as a list (e.g., ["ls", "-la"])
         timeout: Maximum time in seconds to wait for command completion
+        env: Extra environment variables layered over the current environment
+        limiter: Optional semaphore bounding how many of the caller's commands
+            run at once. Time spent waiting for a slot counts against
+            ``timeout``.
 
     Returns:
         Tuple of (return_code, stdout, stderr) where:
@@ -33,6 +42,29 @@ async def run_cmd(
         >>> print(f"Return code: {rc}, Output: {out}")
         Return code: 0, Output: hello
     """
+    if limiter is None:
+        return await _run_cmd(cmd, timeout, env)
+
+    started = time.monotonic()
+    try:
+        await asyncio.wait_for(limiter.acquire(), timeout=timeout)
+    except TimeoutError:
+        logger.warning(
+            "Command timed out waiting for a slot after %ds: %s",
+            timeout,
+            " ".join(cmd),
+        )
+        return 124, "", "timeout"
+    try:
+        remaining = max(0.0, timeout - (time.monotonic() - started))
+        return await _run_cmd(cmd, remaining, env)
+    finally:
+        limiter.release()
+
+
+async def _run_cmd(
+    cmd: list[str], timeout: float, env: dict[str, str] | None
+) -> tuple[int, str, str]:
     try:
         process = await asyncio.create_subprocess_exec(
             *cmd,
@@ -64,6 +96,12 @@ async def run_cmd(
         return 1, "", str(e)
 
 
+@cache
+def cached_which(name: str) -> str | None:
+    """Memoized ``shutil.which``; the tools on PATH do not change at runtime."""
+    return shutil.which(name)
+
+
 def get_docker_cmd() -> str | None:
     """Return a path to the docker binary or None if not found.
 
@@ -190,10 +190,10 @@ def get_settings() -> Settings:
 
     # qBittorrent
     qbt_host = os.environ.get("QBT_HOST") or "qbittorrent"
-    qbt_port_raw = (os.environ.get("QBT_PORT") or "8080").strip()
+    # int() already ignores surrounding whitespace
     try:
-        qbt_port = int(qbt_port_raw) if qbt_port_raw else 8080
-    except Exception:
+        qbt_port = int(os.environ.get("QBT_PORT") or 8080)
+    except ValueError:
         qbt_port = 8080
 
     qbt_user = os.environ.get("QBT_USER")
@@ -27,6 +27,8 @@ from .common import (
 
 logger = logging.getLogger(__name__)
 
+_SPEEDTEST_RATE_RE = re.compile(r"Rate:\s*([0-9.]+)\s*Mb/s")
+
 
 async def cmd_netinventory(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not await guard_sensitive(update, context):
@@ -232,9 +234,7 @@ async def cmd_speedtest(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         return
 
     # Try to parse Mbps for chart rendering
-    import re
-
-    mbps_match = re.search(r"Rate:\s*([0-9.]+)\s*Mb/s", result)
+    mbps_match = _SPEEDTEST_RATE_RE.search(result)
     if mbps_match:
         download_mbps = float(mbps_match.group(1))
         chart = view.render_speedtest_chart(download_mbps)
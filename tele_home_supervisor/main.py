@@ -16,7 +16,7 @@ from telegram.ext import (
     filters,
 )
 
-from . import config
+from . import config, utils
 from .background import cancel_tasks, ensure_started
 from .commands import COMMANDS
 from .handlers import dispatch
@@ -107,6 +107,7 @@ async def _post_shutdown(app: Application) -> None:
     if state is not None:
         await cancel_tasks(state)
         state.save()
+    await utils.close_http_client()
     logger.info("Shutdown complete")
 
 
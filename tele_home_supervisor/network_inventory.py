@@ -228,17 +228,20 @@ async def _scan_with_ping(
     sem = asyncio.Semaphore(32)
 
     async def ping(ip: str) -> NetworkDeviceScan | None:
-        async with sem:
-            remaining = max(1, int(deadline - time.monotonic()))
-            rc, _, _ = await cli.run_cmd(["ping", "-c", "1", "-W", "1", ip], remaining)
-            if rc == 0:
-                return NetworkDeviceScan(
-                    scan_id=scan_id,
-                    scanned_at=scanned_at,
-                    ip=ip,
-                    status="up",
-                )
-            return None
+        # The slot wait counts against the remaining budget, so queued hosts
+        # cannot push the sweep past its deadline.
+        remaining = max(1, int(deadline - time.monotonic()))
+        rc, _, _ = await cli.run_cmd(
+            ["ping", "-c", "1", "-W", "1", ip], remaining, limiter=sem
+        )
+        if rc == 0:
+            return NetworkDeviceScan(
+                scan_id=scan_id,
+                scanned_at=scanned_at,
+                ip=ip,
+                status="up",
+            )
+        return None
 
     results = await asyncio.gather(*(ping(ip) for ip in ips))
     devices = [item for item in results if item is not None]
@@ -184,8 +184,11 @@ async def torrent_add(magnet: str, save_path: str = "/downloads") -> str:
     return await asyncio.to_thread(_call_with_mgr, "add_magnet", magnet, save_path)
 
 
-async def torrent_status() -> str:
-    return await asyncio.to_thread(_call_with_mgr, "get_status")
+async def torrent_status(active_only: bool = False) -> str:
+    """Torrent status report; the whole library unless `active_only`."""
+    return await asyncio.to_thread(
+        _call_with_mgr, "get_status", active_only=active_only
+    )
 
 
 async def torrent_stop(name_substr: str) -> str:
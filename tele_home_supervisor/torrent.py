@@ -11,41 +11,168 @@ handlers. Environment variables:
 
 The class performs lazy connection (the `connect` method builds the
 `qbittorrentapi.Client` and logs in). Returned strings are safe to send
-as plain text or HTML (this module uses `html.escape` before returning
+as plain text or HTML (this module HTML-escapes values before returning
 content).
 """
 
 from __future__ import annotations
 
-import html
+import heapq
+import inspect
 import logging
+import operator
+import re
 import threading
 import time
-
-try:
-    import qbittorrentapi
-except Exception:  # pragma: no cover - import-time fallbacks
-    qbittorrentapi = None  # type: ignore
-else:  # pragma: no cover - normalize missing attrs in some qbittorrentapi builds
-    if not hasattr(qbittorrentapi.Client, "_http_session"):
-        qbittorrentapi.Client._http_session = None
+from collections.abc import Callable, Iterator
+from typing import Any
+from urllib.parse import unquote_plus
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
+_DEBUG = logging.DEBUG
+
+# qbittorrentapi (and its requests stack) is imported on first connect so
+# bot runs that never touch torrents do not pay for it at startup.
+qbittorrentapi = None
+_qbt_import_failed = False
+_CLIENT_TIMEOUT_KWARG: str | None = None
+_CLIENT_ACCEPTS_ADAPTER_ARGS = False
+# Keep-alive pool for the client's requests.Session
+_HTTPADAPTER_ARGS = {"pool_connections": 4, "pool_maxsize": 10}
+
+
+def _load_qbittorrentapi():
+    """Import `qbittorrentapi` once; returns None when it is not installed."""
+    global qbittorrentapi, _qbt_import_failed
+    global _CLIENT_TIMEOUT_KWARG, _CLIENT_ACCEPTS_ADAPTER_ARGS
+    if qbittorrentapi is not None or _qbt_import_failed:
+        return qbittorrentapi
+    try:
+        import qbittorrentapi as module
+    except ImportError:  # pragma: no cover - optional dependency fallback
+        _qbt_import_failed = True
+        return None
+    # Normalize missing attrs in some qbittorrentapi builds
+    if not hasattr(module.Client, "_http_session"):
+        module.Client._http_session = None
+    # Probe once how this build takes a request timeout: older clients accept
+    # `timeout=`, current ones forward `REQUESTS_ARGS` to every request.
+    params = inspect.signature(module.Client).parameters
+    if "timeout" in params:
+        _CLIENT_TIMEOUT_KWARG = "timeout"
+    elif "REQUESTS_ARGS" in params:
+        _CLIENT_TIMEOUT_KWARG = "REQUESTS_ARGS"
+    _CLIENT_ACCEPTS_ADAPTER_ARGS = "HTTPADAPTER_ARGS" in params
+    qbittorrentapi = module
+    return module
+
+
+# WebUI URL for the configured host/port, shared by managers built without
+# overrides (the common case: one per handler call)
+_DEFAULT_BASE_URL = f"http://{settings.QBT_HOST}:{settings.QBT_PORT}"
+
+# qBittorrent reports 'missingFiles' (or 'missing_files' in some versions)
+_MISSING_STATES = frozenset({"missingfiles", "missing_files"})
+
+# Torrents rendered by get_status; the rest would not fit a Telegram message
+_STATUS_LIMIT = 20
+# Bursts of /status from several chats within this window share one report
+_STATUS_CACHE_TTL_S = 2.0
+# Status chunk size, below Telegram's 4096-character message limit
+_STATUS_CHUNK_CHARS = 4000
+# Appended to a truncated get_status report; fits in the 96 chars of headroom
+_MORE_TMPL = "\n\n... and %d more torrent(s)"
+
+_ADD_OK_TMPL = "✅ Added to download queue:\n<b>{name}</b>"
+_PAUSED_TMPL = "Paused: {names}"
+_RESUMED_TMPL = "Resumed: {names}"
+_DELETED_TMPL = "{action}: {names}"
+_HASH_PAUSED_TMPL = "⏸️ Paused: {name}"
+_HASH_RESUMED_TMPL = "▶️ Resumed: {name}"
+_HASH_DELETED_TMPL = "🗑️ Deleted: {name}"
+_CLEANED_TMPL = "🗑️ Cleaned {count} torrent(s) with missing files:\n{names}"
+_INFO_TMPL = (
+    "<b>{name}</b>\n"
+    "Status: {state}\n"
+    "Progress: {progress:.1f}%\n"
+    "Size: {size}\n"
+    "↓ {dlspeed:.1f} KiB/s | ↑ {upspeed:.1f} KiB/s"
+)
+
+# SHA-1 (v1) or SHA-256 (v2) info-hash in hex
+_FULL_HASH_RE = re.compile(r"[0-9a-fA-F]{40}|[0-9a-fA-F]{64}")
+
+_NEEDS_ESCAPE_RE = re.compile(r"[&<>'\"]")
+
+# name, state, progress %, size suffix (" (done/total)" or ""), KiB/s; filled
+# with %-formatting, which is cheaper than str.format for these simple types
+_STATUS_TMPL = "<b>%s</b>\n  Status: %s\n  Progress: %.1f%%%s\n  Speed: %.1f KiB/s"
+_SIZE_SUFFIX_TMPL = " (%s/%s)"
+
+
+def _fast_escape(text: str) -> str:
+    """HTML-escape *text*, skipping the copy when nothing needs escaping.
+
+    Matches `html.escape(text)`.  The replacements run on the UTF-8 bytes:
+    the escaped characters are single ASCII bytes that never occur inside a
+    multi-byte sequence, and bytes.replace avoids scanning wide (non-Latin)
+    str storage.
+    """
+    if not _NEEDS_ESCAPE_RE.search(text):
+        return text
+    return (
+        text.encode("utf-8", "surrogatepass")
+        .replace(b"&", b"&amp;")
+        .replace(b"<", b"&lt;")
+        .replace(b">", b"&gt;")
+        .replace(b'"', b"&quot;")
+        .replace(b"'", b"&#x27;")
+        .decode("utf-8", "surrogatepass")
+    )
+
+
+def _magnet_dn(magnet_link: str) -> str:
+    """Return the decoded `dn=` display name of a magnet link."""
+    if not magnet_link.startswith("magnet:?"):
+        return "Unknown Torrent"
+    query = magnet_link[8:]
+    if query.startswith("dn="):
+        start = 3
+    else:
+        start = query.find("&dn=")
+        if start < 0:
+            return "Unknown Torrent"
+        start += 4
+    end = query.find("&", start)
+    raw = query[start:] if end < 0 else query[start:end]
+    return unquote_plus(raw) if raw else "Unknown Torrent"
+
+
+_DECIMAL_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_DECIMAL_DIVS = tuple(1000**i for i in range(len(_DECIMAL_UNITS)))
+# Unit index for the smallest value of each bit length (2 ** (n - 1)).  A
+# bit length spans a factor of two, so at most one step up is ever needed.
+_BITLEN_UNIT_IDX = tuple(
+    min(len(_DECIMAL_UNITS) - 1, (len(str(1 << (n - 1))) - 1) // 3) if n else 0
+    for n in range(64)
+)
 
 
 def fmt_bytes_compact_decimal(num_bytes: int) -> str:
     """Format bytes as a compact decimal string (e.g. 244.4MB)."""
-    units = ["B", "KB", "MB", "GB", "TB", "PB"]
-    value = float(max(0, num_bytes))
-    unit_idx = 0
-    while value >= 1000.0 and unit_idx < len(units) - 1:
-        value /= 1000.0
-        unit_idx += 1
+    num = int(max(0, num_bytes))
+    bits = num.bit_length()
+    if bits >= len(_BITLEN_UNIT_IDX):
+        unit_idx = len(_DECIMAL_UNITS) - 1
+    else:
+        unit_idx = _BITLEN_UNIT_IDX[bits]
+        if unit_idx < len(_DECIMAL_UNITS) - 1 and num >= _DECIMAL_DIVS[unit_idx + 1]:
+            unit_idx += 1
     if unit_idx == 0:
-        return f"{int(value)}{units[unit_idx]}"
-    return f"{value:.1f}{units[unit_idx]}"
+        return f"{num}{_DECIMAL_UNITS[0]}"
+    return f"{num / _DECIMAL_DIVS[unit_idx]:.1f}{_DECIMAL_UNITS[unit_idx]}"
 
 
 # ---------------------------------------------------------------------------
@@ -54,7 +181,10 @@ def fmt_bytes_compact_decimal(num_bytes: int) -> str:
 
 _mgr_lock = threading.RLock()
 _mgr: TorrentManager | None = None
+_mgr_last_used = 0.0
 _ban_until = 0.0
+# After this much idle time the cached session is checked before reuse
+_IDLE_RECHECK_S = 300.0
 
 
 def get_manager() -> TorrentManager | None:
@@ -63,7 +193,7 @@ def get_manager() -> TorrentManager | None:
     Thread-safe.  Returns ``None`` when the connection cannot be
     established or if we are currently "banned" (e.g. after a 403).
     """
-    global _mgr, _ban_until
+    global _mgr, _mgr_last_used
     now = time.time()
     if now < _ban_until:
         logger.warning(
@@ -73,10 +203,21 @@ def get_manager() -> TorrentManager | None:
         return None
 
     with _mgr_lock:
+        mono = time.monotonic()
+        if (
+            _mgr is not None
+            and _mgr.qbt_client is not None
+            and mono - _mgr_last_used > _IDLE_RECHECK_S
+            and not _mgr.is_alive()
+        ):
+            # The kept-alive session went stale while idle; rebuild once.
+            _mgr = None
+            _drop_shared_client()
         if _mgr is None:
             _mgr = TorrentManager()
         if _mgr.qbt_client is None and not _mgr.connect():
             return None
+        _mgr_last_used = mono
         return _mgr
 
 
@@ -85,6 +226,71 @@ def reset_manager() -> None:
     global _mgr
     with _mgr_lock:
         _mgr = None
+    _drop_shared_client()
+
+
+# ---------------------------------------------------------------------------
+# Shared client – one logged-in qBittorrent session per process
+# ---------------------------------------------------------------------------
+
+_client_lock = threading.Lock()
+_shared_client: qbittorrentapi.Client | None = None
+_shared_client_key: tuple[str, str, str, float] | None = None
+
+
+def _build_client(
+    base_url: str, username: str, password: str, timeout_s: float
+) -> qbittorrentapi.Client:
+    """Construct a `qbittorrentapi.Client` with the configured timeout."""
+    kwargs: dict[str, Any] = {}
+    if _CLIENT_TIMEOUT_KWARG == "timeout":
+        kwargs["timeout"] = timeout_s
+    elif _CLIENT_TIMEOUT_KWARG == "REQUESTS_ARGS":
+        kwargs["REQUESTS_ARGS"] = {"timeout": timeout_s}
+    if _CLIENT_ACCEPTS_ADAPTER_ARGS:
+        kwargs["HTTPADAPTER_ARGS"] = _HTTPADAPTER_ARGS
+    client = qbittorrentapi.Client(
+        host=base_url, username=username, password=password, **kwargs
+    )
+    for attr in ("timeout", "request_timeout"):
+        if hasattr(client, attr):
+            try:
+                setattr(client, attr, timeout_s)
+            except Exception as exc:
+                if logger.isEnabledFor(_DEBUG):
+                    logger.debug("Failed to set qBittorrent client %s: %s", attr, exc)
+    return client
+
+
+def _get_shared_client(
+    base_url: str, username: str, password: str, timeout_s: float
+) -> qbittorrentapi.Client:
+    """Return the process-wide logged-in client for these credentials.
+
+    The client is only cached after a successful `auth_log_in()`, so a
+    failed login is retried on the next call.  Thread-safe.
+    """
+    global _shared_client, _shared_client_key
+    key = (base_url, username, password, timeout_s)
+    client = _shared_client
+    if client is not None and _shared_client_key == key:
+        return client
+    with _client_lock:
+        if _shared_client is not None and _shared_client_key == key:
+            return _shared_client
+        client = _build_client(base_url, username, password, timeout_s)
+        client.auth_log_in()
+        _shared_client = client
+        _shared_client_key = key
+        return client
+
+
+def _drop_shared_client() -> None:
+    """Forget the shared client so the next connect logs in again."""
+    global _shared_client, _shared_client_key
+    with _client_lock:
+        _shared_client = None
+        _shared_client_key = None
 
 
 def _check_403(exc: Exception) -> bool:
@@ -103,6 +309,147 @@ def _check_403(exc: Exception) -> bool:
     return is_403
 
 
+def _log_failure(msg: str, exc: Exception) -> None:
+    """Log a failed WebUI call.
+
+    Transport failures are expected while qBittorrent restarts, so they get
+    a one-line warning.  HTTP errors and failed logins also subclass
+    `APIConnectionError` but mean the WebUI answered, so like anything else
+    they keep their traceback.
+    """
+    if (
+        qbittorrentapi is not None
+        and isinstance(exc, qbittorrentapi.APIConnectionError)
+        and not isinstance(exc, (qbittorrentapi.HTTPError, qbittorrentapi.LoginFailed))
+    ):
+        logger.warning("qBittorrent unreachable: %s", exc)
+    else:
+        logger.exception(msg, exc)
+
+
+_BASIC_KEYS = ("name", "state", "progress", "dlspeed", "upspeed")
+_BASIC_ITEMS = operator.itemgetter(*_BASIC_KEYS)
+_BASIC_FIELDS = operator.attrgetter(*_BASIC_KEYS)
+
+
+def _reader(t) -> Callable[..., Any]:
+    """Return a `get(key, default=None)` for a torrent entry.
+
+    qbittorrentapi entries are dict subclasses whose attribute access goes
+    through a Python-level `__getattr__`; plain item reads are far cheaper.
+    """
+    if isinstance(t, dict):
+        return t.get
+    return lambda key, default=None: getattr(t, key, default)
+
+
+def _basic_fields(t) -> tuple:
+    """Return `(name, state, progress, dlspeed, upspeed)`; missing fields are None.
+
+    The common case is a single `itemgetter` (dict entries) or `attrgetter`
+    call; entries lacking one of the fields fall back to per-field lookups.
+    """
+    try:
+        if isinstance(t, dict):
+            return _BASIC_ITEMS(t)
+        return _BASIC_FIELDS(t)
+    except KeyError, AttributeError:
+        get = _reader(t)
+        return tuple(get(key) for key in _BASIC_KEYS)
+
+
+def _dlspeed_of(t: dict) -> int:
+    """Sort key for `sync_maindata` entries: download speed in B/s."""
+    return t.get("dlspeed") or 0
+
+
+def _torrent_hash(t) -> str | None:
+    """Return the info-hash of a torrent entry across client versions."""
+    get = _reader(t)
+    return get("hash") or get("info_hash") or get("hashString")
+
+
+def _torrent_sizes(t, progress_frac: float, debug: bool = False) -> tuple[int, int]:
+    """Return `(downloaded, total_size)` in bytes for a torrent object.
+
+    `downloaded` is clamped to `total_size`; it is 0 whenever the size is
+    unknown, since callers only show it next to a known size.
+    """
+    get = _reader(t)
+    total_size = get("total_size")
+    if total_size is None:
+        total_size = get("size")
+    if type(total_size) is not int:
+        try:
+            total_size = int(total_size or 0)
+        except Exception:
+            total_size = 0
+    if total_size <= 0:
+        return 0, 0
+
+    for attr in ("completed", "downloaded", "downloaded_session"):
+        raw = get(attr)
+        if raw is None:
+            continue
+        if type(raw) is int:
+            downloaded = raw
+            break
+        try:
+            downloaded = int(raw)
+            break
+        except (TypeError, ValueError) as e:
+            if debug:
+                logger.debug(
+                    "Cannot parse %s for torrent %s: %s",
+                    attr,
+                    get("name", "<unknown>"),
+                    e,
+                )
+    else:
+        downloaded = int(progress_frac * total_size)
+    if downloaded < 0:
+        downloaded = 0
+    elif downloaded > total_size:
+        downloaded = total_size
+    return downloaded, total_size
+
+
+def _format_status(t, debug: bool = False) -> str:
+    """Render one torrent as an HTML-safe status block."""
+    name, state, progress_frac, dlspeed, _ = _basic_fields(t)
+    name = _fast_escape("<unknown>" if name is None else name)
+    state = _fast_escape("unknown" if state is None else str(state))
+    progress_frac = progress_frac or 0.0
+    progress = progress_frac * 100.0
+    dlspeed = (dlspeed or 0) / 1024.0
+    downloaded, total_size = _torrent_sizes(t, progress_frac, debug)
+    size = ""
+    if total_size > 0:
+        size = _SIZE_SUFFIX_TMPL % (
+            fmt_bytes_compact_decimal(downloaded),
+            fmt_bytes_compact_decimal(total_size),
+        )
+    return _STATUS_TMPL % (name, state, progress, size, dlspeed)
+
+
+def _torrent_summary(t) -> dict:
+    """Return the dict used for torrent list pages and keyboards."""
+    name, state, progress_frac, dlspeed, _ = _basic_fields(t)
+    progress_frac = progress_frac or 0.0
+    downloaded, total_size = _torrent_sizes(t, progress_frac)
+    size_summary = ""
+    if total_size > 0:
+        size_summary = f"{fmt_bytes_compact_decimal(downloaded)}/{fmt_bytes_compact_decimal(total_size)}"
+    return {
+        "name": name or "",
+        "hash": _torrent_hash(t) or "",
+        "state": "unknown" if state is None else state,
+        "progress": progress_frac * 100.0,
+        "dlspeed": (dlspeed or 0) / 1024.0,
+        "size_summary": size_summary,
+    }
+
+
 class TorrentManager:
     """Minimal wrapper around `qbittorrentapi.Client`.
 
@@ -126,49 +473,41 @@ class TorrentManager:
             float(timeout_s) if timeout_s is not None else settings.QBT_TIMEOUT_S
         )
 
-        self._base_url = f"http://{self.host}:{self.port}"
+        self._base_url = (
+            f"http://{self.host}:{self.port}" if host or port else _DEFAULT_BASE_URL
+        )
         self.qbt_client: qbittorrentapi.Client | None = None
+        # sync_maindata cursor and the torrent map rebuilt from its diffs; both
+        # belong to the WebUI session of `_sync_client`
+        self._rid = 0
+        self._state: dict[str, dict] = {}
+        self._sync_client: qbittorrentapi.Client | None = None
+        self._sync_lock = threading.Lock()
+        # (monotonic timestamp, (limit, active_only), text) of the last
+        # successful get_status; replaced as a whole so readers need no lock
+        self._status_cache: tuple[float, tuple[int | None, bool], str] | None = None
 
     def connect(self) -> bool:
         """Build the client and log in to the WebUI.
 
         Returns True on success, False otherwise.
         """
-        if qbittorrentapi is None:
+        if _load_qbittorrentapi() is None:
             logger.error("qbittorrentapi package is not installed")
             return False
 
         try:
-            try:
-                self.qbt_client = qbittorrentapi.Client(
-                    host=self._base_url,
-                    username=self.username,
-                    password=self.password,
-                    timeout=self.timeout_s,
-                )
-            except TypeError:
-                self.qbt_client = qbittorrentapi.Client(
-                    host=self._base_url,
-                    username=self.username,
-                    password=self.password,
-                )
-            if not hasattr(self.qbt_client, "_http_session"):
-                self.qbt_client._http_session = None
-            for attr in ("timeout", "request_timeout"):
-                if hasattr(self.qbt_client, attr):
-                    try:
-                        setattr(self.qbt_client, attr, self.timeout_s)
-                    except Exception as exc:
-                        logger.debug(
-                            "Failed to set qBittorrent client %s: %s", attr, exc
-                        )
-            self.qbt_client.auth_log_in()
-            # Accessing app.version can raise in some client states; guard it
-            try:
-                ver = getattr(self.qbt_client.app, "version", None)
-                logger.debug("Connected to qBittorrent: %s", ver)
-            except Exception:
-                logger.debug("Connected to qBittorrent (version unknown)")
+            self.qbt_client = _get_shared_client(
+                self._base_url, self.username, self.password, self.timeout_s
+            )
+            # app.version is an extra WebUI round trip; only fetch it for debug
+            # logs.  Accessing it can raise in some client states; guard it.
+            if logger.isEnabledFor(_DEBUG):
+                try:
+                    ver = getattr(self.qbt_client.app, "version", None)
+                    logger.debug("Connected to qBittorrent: %s", ver)
+                except Exception:
+                    logger.debug("Connected to qBittorrent (version unknown)")
             return True
         except qbittorrentapi.LoginFailed:  # type: ignore
             logger.warning("Invalid qBittorrent login credentials")
@@ -179,6 +518,18 @@ class TorrentManager:
             logger.exception("Connection error to qBittorrent: %s", exc)
             return False
 
+    def is_alive(self) -> bool:
+        """Return True when the cached client still answers the WebUI."""
+        if self.qbt_client is None:
+            return False
+        try:
+            self.qbt_client.app_version()
+            return True
+        except Exception as exc:
+            if logger.isEnabledFor(_DEBUG):
+                logger.debug("qBittorrent session check failed: %s", exc)
+            return False
+
     def add_magnet(self, magnet_link: str, save_path: str = "/downloads") -> str:
         """Add a magnet link to qBittorrent.
 
@@ -194,21 +545,13 @@ class TorrentManager:
             self.qbt_client.torrents_add(urls=magnet_link, save_path=save_path)
 
             # Extract name from magnet for better confirmation
-            from urllib.parse import parse_qs
-
-            name = "Unknown Torrent"
-            if magnet_link.startswith("magnet:?"):
-                query = magnet_link[8:]
-                params = parse_qs(query)
-                if "dn" in params:
-                    name = params["dn"][0]
-
-            return f"✅ Added to download queue:\n<b>{html.escape(name)}</b>"
+            name = _magnet_dn(magnet_link)
+            return _ADD_OK_TMPL.format_map({"name": _fast_escape(name)})
         except Exception as exc:
             if _check_403(exc):
                 return "Failed to connect to qBittorrent."
-            logger.exception("Failed to add torrent: %s", exc)
-            return f"Failed to add torrent: {html.escape(str(exc))}"
+            _log_failure("Failed to add torrent: %s", exc)
+            return f"Failed to add torrent: {_fast_escape(str(exc))}"
 
     def _find_torrents(self, name_substr: str) -> list[dict]:
         """Return list of torrents matching `name_substr` (case-insensitive).
@@ -221,20 +564,20 @@ class TorrentManager:
         try:
             torrents = self.qbt_client.torrents_info() or []
             matches: list[dict] = []
-            target = name_substr.lower()
+            append = matches.append
+            reader = _reader
+            # A compiled IGNORECASE search avoids lowercasing every name
+            match = re.compile(re.escape(name_substr), re.IGNORECASE).search
             for t in torrents:
-                tname = getattr(t, "name", "") or ""
-                if target in tname.lower():
-                    thash = (
-                        getattr(t, "hash", None)
-                        or getattr(t, "info_hash", None)
-                        or getattr(t, "hashString", None)
-                    )
-                    matches.append(
+                get = reader(t)
+                tname = get("name", "") or ""
+                if match(tname):
+                    thash = _torrent_hash(t)
+                    append(
                         {
                             "name": tname,
                             "hash": thash,
-                            "state": getattr(t, "state", "unknown"),
+                            "state": get("state", "unknown"),
                         }
                     )
             return matches
@@ -332,15 +675,10 @@ class TorrentManager:
                         )  # type: ignore
                         deleted = True
 
-            # Verify deletion actually happened: query current torrents
+            # Verify deletion actually happened: query only the requested hashes
             try:
-                remaining = self.qbt_client.torrents_info() or []  # type: ignore
-                remaining_hashes = {
-                    getattr(t, "hash", None)
-                    or getattr(t, "info_hash", None)
-                    or getattr(t, "hashString", None)
-                    for t in remaining
-                }
+                remaining = self.qbt_client.torrents_info(hashes=hashes_joined) or []  # type: ignore
+                remaining_hashes = {_torrent_hash(t) for t in remaining}
                 # If any of the requested hashes are still present, consider as not deleted
                 if any(h in remaining_hashes for h in hashes):
                     logger.warning(
@@ -351,9 +689,10 @@ class TorrentManager:
             except Exception as e:
                 if _check_403(e):
                     return False
-                logger.debug(
-                    "Delete verification failed; assuming delete succeeded: %s", e
-                )
+                if logger.isEnabledFor(_DEBUG):
+                    logger.debug(
+                        "Delete verification failed; assuming delete succeeded: %s", e
+                    )
 
             return deleted
         except Exception as exc:
@@ -361,10 +700,13 @@ class TorrentManager:
             logger.exception("Error deleting torrents")
             return False
 
-    def stop_by_name(self, name_substr: str) -> str:
-        """Stop (pause) torrents whose name includes `name_substr`.
+    def _mutate_by_name(
+        self, name_substr: str, action: str, delete_files: bool = True
+    ) -> str:
+        """Apply `action` ('pause', 'resume' or 'delete') to matching torrents.
 
-        Returns a human-readable result string.
+        Performs one list fetch plus one mutation request and returns a
+        human-readable result string.
         """
         matches = self._find_torrents(name_substr)
         if not matches:
@@ -372,28 +714,33 @@ class TorrentManager:
         hashes = [m["hash"] for m in matches if m.get("hash")]
         if not hashes:
             return "Found matching torrents but could not determine their hashes."
-        ok = self._call_pause_resume(hashes, "pause")
-        if ok:
-            names = ", ".join(m["name"] for m in matches)
-            return f"Paused: {html.escape(names)}"
-        return "Failed to pause torrents."
+        if action == "delete":
+            ok = self._call_delete(hashes, delete_files=delete_files)
+        else:
+            ok = self._call_pause_resume(hashes, action)
+        if not ok:
+            return f"Failed to {action} torrents."
+        names = _fast_escape(", ".join(m["name"] for m in matches))
+        if action == "pause":
+            return _PAUSED_TMPL.format_map({"names": names})
+        if action == "resume":
+            return _RESUMED_TMPL.format_map({"names": names})
+        label = "Deleted (files removed)" if delete_files else "Deleted (kept files)"
+        return _DELETED_TMPL.format_map({"action": label, "names": names})
+
+    def stop_by_name(self, name_substr: str) -> str:
+        """Stop (pause) torrents whose name includes `name_substr`.
+
+        Returns a human-readable result string.
+        """
+        return self._mutate_by_name(name_substr, "pause")
 
     def start_by_name(self, name_substr: str) -> str:
         """Start (resume) torrents whose name includes `name_substr`.
 
         Returns a human-readable result string.
         """
-        matches = self._find_torrents(name_substr)
-        if not matches:
-            return "No matching torrents found."
-        hashes = [m["hash"] for m in matches if m.get("hash")]
-        if not hashes:
-            return "Found matching torrents but could not determine their hashes."
-        ok = self._call_pause_resume(hashes, "resume")
-        if ok:
-            names = ", ".join(m["name"] for m in matches)
-            return f"Resumed: {html.escape(names)}"
-        return "Failed to resume torrents."
+        return self._mutate_by_name(name_substr, "resume")
 
     def preview_by_name(self, name_substr: str) -> str:
         """Preview torrents matching `name_substr`."""
@@ -402,8 +749,8 @@ class TorrentManager:
             return "No matching torrents found."
         lines = ["<b>Matching torrents:</b>"]
         for m in matches[:25]:
-            name = html.escape(m.get("name", "unknown"))
-            state = html.escape(m.get("state", "unknown"))
+            name = _fast_escape(m.get("name", "unknown"))
+            state = _fast_escape(m.get("state", "unknown"))
             lines.append(f"<code>{name}</code> • {state}")
         if len(matches) > 25:
             lines.append(f"<i>...and {len(matches) - 25} more</i>")
@@ -414,90 +761,152 @@ class TorrentManager:
 
         If `delete_files` is True, also delete the content files.
         """
-        matches = self._find_torrents(name_substr)
-        if not matches:
-            return "No matching torrents found."
-        hashes = [m["hash"] for m in matches if m.get("hash")]
-        if not hashes:
-            return "Found matching torrents but could not determine their hashes."
-        ok = self._call_delete(hashes, delete_files=delete_files)
-        if ok:
-            names = ", ".join(m["name"] for m in matches)
-            action = (
-                "Deleted (files removed)" if delete_files else "Deleted (kept files)"
-            )
-            return f"{action}: {html.escape(names)}"
-        return "Failed to delete torrents."
+        return self._mutate_by_name(name_substr, "delete", delete_files=delete_files)
 
-    def get_status(self) -> str:
-        """Return a formatted HTML-safe status of torrents.
+    def _sync_torrents(self) -> list[dict]:
+        """Return all torrents, applying the `sync_maindata` diff since last call.
 
-        Returns a short multi-line report or an error string.
+        After the first (full) response the WebUI only sends changed fields
+        and removed hashes, so repeated polls cost O(changed) rather than
+        O(library).  The endpoint keys torrents by hash; the hash is copied
+        into each entry so they read like `torrents_info` items.  The cursor
+        restarts whenever the client was rebuilt or a sync fails, since a new
+        WebUI session (e.g. after a qBittorrent restart) knows nothing of it.
+        """
+        with self._sync_lock:
+            if self._sync_client is not self.qbt_client:
+                self._rid = 0
+                self._state = {}
+                self._sync_client = self.qbt_client
+            try:
+                data = self.qbt_client.sync_maindata(rid=self._rid) or {}
+            except Exception:
+                self._rid = 0
+                self._state = {}
+                raise
+            state = self._state
+            if data.get("full_update"):
+                state = self._state = {}
+            for thash, fields in (data.get("torrents") or {}).items():
+                entry = state.get(thash)
+                if entry is None:
+                    state[thash] = {**fields, "hash": thash}
+                else:
+                    entry.update(fields)
+            for thash in data.get("torrents_removed") or ():
+                state.pop(thash, None)
+            self._rid = data.get("rid", 0)
+            return list(state.values())
+
+    def _status_torrents(
+        self, limit: int | None, active_only: bool
+    ) -> tuple[list, int]:
+        """Return the torrents to render and how many the view holds in total.
+
+        By default the whole library is listed, newest first; when `limit` is
+        given only the newest `limit` torrents are requested from the WebUI so
+        large libraries are not transferred just to be dropped.  With
+        `active_only`, only transferring torrents are listed, fastest first,
+        read from the `sync_maindata` snapshot so repeated polls only transfer
+        what changed.  Requires a connected client; WebUI errors propagate to
+        the caller.
+        """
+        if active_only:
+            torrents = self._sync_torrents()
+            active = [t for t in torrents if t.get("dlspeed") or t.get("upspeed")]
+            if limit is None:
+                active.sort(key=_dlspeed_of, reverse=True)
+                return active, len(active)
+            return heapq.nlargest(limit, active, key=_dlspeed_of), len(active)
+        if limit is None:
+            torrents = self.qbt_client.torrents_info() or []
+            return torrents, len(torrents)
+        torrents = (
+            self.qbt_client.torrents_info(sort="added_on", reverse=True, limit=limit)
+            or []
+        )
+        total = len(torrents)
+        if total >= limit:
+            # A full page may hide more; the incremental sync snapshot counts
+            # the library without re-sending torrents that have not changed.
+            total = max(total, len(self._sync_torrents()))
+        return torrents, total
+
+    def iter_torrent_lines(
+        self, limit: int | None = None, active_only: bool = False
+    ) -> Iterator[str]:
+        """Yield one HTML-safe status block per torrent of the status view."""
+        torrents, _total = self._status_torrents(limit, active_only)
+        debug = logger.isEnabledFor(_DEBUG)
+        fmt = _format_status  # local alias: skips a global lookup per torrent
+        for t in torrents:
+            yield fmt(t, debug)
+
+    def _render_status(self, limit: int | None, active_only: bool) -> tuple[str, bool]:
+        """Render the status view into one message; return `(text, ok)`.
+
+        Blocks are added until the next would overflow `_STATUS_CHUNK_CHARS`;
+        the rest are only counted, never formatted, for the "... and N more"
+        line.  `ok` is False when the text is an error string because the
+        WebUI could not be read.
         """
         if self.qbt_client is None:
             ok = self.connect()
             if not ok:
-                return "Failed to connect to qBittorrent."
+                return "Failed to connect to qBittorrent.", False
 
         try:
-            torrents = self.qbt_client.torrents_info()
-            if not torrents:
-                return "No active torrents found."
-
-            parts: list[str] = []
+            torrents, total = self._status_torrents(limit, active_only)
+            debug = logger.isEnabledFor(_DEBUG)
+            fmt = _format_status  # local alias: skips a global lookup per torrent
+            buf: list[str] = []
+            size = -2
             for t in torrents:
-                name = html.escape(getattr(t, "name", "<unknown>"))
-                state = html.escape(str(getattr(t, "state", "unknown")))
-                progress_frac = getattr(t, "progress", 0.0) or 0.0
-                progress = progress_frac * 100.0
-                dlspeed = (getattr(t, "dlspeed", 0) or 0) / 1024.0
-
-                total_size_raw = getattr(t, "total_size", None)
-                if total_size_raw is None:
-                    total_size_raw = getattr(t, "size", None)
-                try:
-                    total_size = int(total_size_raw or 0)
-                except Exception:
-                    total_size = 0
-
-                downloaded: int | None = None
-                for attr in ("completed", "downloaded", "downloaded_session"):
-                    raw = getattr(t, attr, None)
-                    if raw is None:
-                        continue
-                    val = None
-                    try:
-                        val = int(raw)
-                    except (TypeError, ValueError) as e:
-                        logger.debug(
-                            "Cannot parse %s for torrent %s: %s", attr, name, e
-                        )
-                    if val is not None:
-                        downloaded = val
-                        break
-                if downloaded is None and total_size > 0:
-                    downloaded = int(progress_frac * total_size)
-                if downloaded is None:
-                    downloaded = 0
-                if total_size > 0:
-                    downloaded = max(0, min(downloaded, total_size))
-                    size_summary = f"{fmt_bytes_compact_decimal(downloaded)}/{fmt_bytes_compact_decimal(total_size)}"
-                    progress_line = f"  Progress: {progress:.1f}% ({size_summary})\n"
-                else:
-                    progress_line = f"  Progress: {progress:.1f}%\n"
-
-                parts.append(
-                    f"<b>{name}</b>\n"
-                    f"  Status: {state}\n"
-                    f"{progress_line}"
-                    f"  Speed: {dlspeed:.1f} KiB/s"
-                )
-            return "\n\n".join(parts)
+                block = fmt(t, debug)
+                if buf and size + 2 + len(block) > _STATUS_CHUNK_CHARS:
+                    break
+                size += 2 + len(block)
+                buf.append(block)
         except Exception as exc:
             if _check_403(exc):
-                return "Failed to connect to qBittorrent."
-            logger.exception("Error retrieving qBittorrent status: %s", exc)
-            return f"Error retrieving status: {html.escape(str(exc))}"
+                return "Failed to connect to qBittorrent.", False
+            _log_failure("Error retrieving qBittorrent status: %s", exc)
+            return f"Error retrieving status: {_fast_escape(str(exc))}", False
+        if not buf:
+            return "No active torrents found.", True
+        text = "\n\n".join(buf)
+        omitted = total - len(buf)
+        if omitted > 0:
+            text += _MORE_TMPL % omitted
+        return text, True
+
+    def get_status(
+        self, limit: int | None = _STATUS_LIMIT, active_only: bool = False
+    ) -> str:
+        """Return a formatted HTML-safe status of torrents.
+
+        Lists the newest `limit` torrents of the whole library (all when
+        None).  With `active_only=True` only transferring torrents are listed,
+        fastest first, again capped at `limit`.  The report is cut to one
+        message and ends with a "... and N more" line when the view holds
+        more torrents than it shows.  Returns a short multi-line report or an
+        error string.  Repeated calls within `_STATUS_CACHE_TTL_S` reuse the
+        last successful report; errors are never cached.
+        """
+        key = (limit, active_only)
+        cached = self._status_cache
+        if (
+            cached is not None
+            and cached[1] == key
+            and time.monotonic() - cached[0] < _STATUS_CACHE_TTL_S
+        ):
+            return cached[2]
+        # Rendered without a lock so a slow WebUI only delays its own callers;
+        # concurrent misses may each fetch, and the last one published wins.
+        text, ok = self._render_status(limit, active_only)
+        if ok:
+            self._status_cache = (time.monotonic(), key, text)
+        return text
 
     def get_torrent_list(self) -> list[dict]:
         """Return list of all torrents with detailed info."""
@@ -506,55 +915,7 @@ class TorrentManager:
                 return []
         try:
             torrents = self.qbt_client.torrents_info() or []
-            result = []
-            for t in torrents:
-                thash = (
-                    getattr(t, "hash", None)
-                    or getattr(t, "info_hash", None)
-                    or getattr(t, "hashString", None)
-                )
-
-                # Calculate size summary
-                total_size_raw = (
-                    getattr(t, "total_size", None) or getattr(t, "size", None) or 0
-                )
-                try:
-                    total_size = int(total_size_raw)
-                except Exception:
-                    total_size = 0
-
-                progress_frac = getattr(t, "progress", 0.0) or 0.0
-                downloaded = None
-                for attr in ("completed", "downloaded", "downloaded_session"):
-                    val = getattr(t, attr, None)
-                    if val is not None:
-                        try:
-                            downloaded = int(val)
-                            break
-                        except ValueError:
-                            pass
-
-                if downloaded is None and total_size > 0:
-                    downloaded = int(progress_frac * total_size)
-                if downloaded is None:
-                    downloaded = 0
-
-                size_summary = ""
-                if total_size > 0:
-                    downloaded = max(0, min(downloaded, total_size))
-                    size_summary = f"{fmt_bytes_compact_decimal(downloaded)}/{fmt_bytes_compact_decimal(total_size)}"
-
-                result.append(
-                    {
-                        "name": getattr(t, "name", "") or "",
-                        "hash": thash or "",
-                        "state": getattr(t, "state", "unknown"),
-                        "progress": progress_frac * 100.0,
-                        "dlspeed": (getattr(t, "dlspeed", 0) or 0) / 1024.0,
-                        "size_summary": size_summary,
-                    }
-                )
-            return result
+            return [_torrent_summary(t) for t in torrents]
         except Exception as exc:
             _check_403(exc)
             logger.exception("Error getting torrent list")
@@ -566,22 +927,24 @@ class TorrentManager:
             if not self.connect():
                 return None
         try:
-            torrents = self.qbt_client.torrents_info() or []
+            if _FULL_HASH_RE.fullmatch(torrent_hash):
+                # A complete hash can be looked up without listing everything
+                torrents = self.qbt_client.torrents_info(hashes=torrent_hash) or []
+            else:
+                torrents = self.qbt_client.torrents_info() or []
             for t in torrents:
-                thash = (
-                    getattr(t, "hash", None)
-                    or getattr(t, "info_hash", None)
-                    or getattr(t, "hashString", None)
-                )
+                thash = _torrent_hash(t)
                 if thash and thash.startswith(torrent_hash):
+                    name, state, progress, dlspeed, upspeed = _basic_fields(t)
+                    get = _reader(t)
                     return {
-                        "name": getattr(t, "name", "") or "",
+                        "name": name or "",
                         "hash": thash,
-                        "state": getattr(t, "state", "unknown"),
-                        "progress": getattr(t, "progress", 0.0) or 0.0,
-                        "size": getattr(t, "total_size", 0) or getattr(t, "size", 0),
-                        "dlspeed": getattr(t, "dlspeed", 0) or 0,
-                        "upspeed": getattr(t, "upspeed", 0) or 0,
+                        "state": "unknown" if state is None else state,
+                        "progress": progress or 0.0,
+                        "size": get("total_size", 0) or get("size", 0),
+                        "dlspeed": dlspeed or 0,
+                        "upspeed": upspeed or 0,
                     }
             return None
         except Exception as exc:
@@ -596,7 +959,7 @@ class TorrentManager:
             return "Torrent not found."
         ok = self._call_pause_resume([torrent["hash"]], "pause")
         if ok:
-            return f"⏸️ Paused: {html.escape(torrent['name'])}"
+            return _HASH_PAUSED_TMPL.format_map({"name": _fast_escape(torrent["name"])})
         return "Failed to pause torrent."
 
     def start_by_hash(self, torrent_hash: str) -> str:
@@ -606,7 +969,9 @@ class TorrentManager:
             return "Torrent not found."
         ok = self._call_pause_resume([torrent["hash"]], "resume")
         if ok:
-            return f"▶️ Resumed: {html.escape(torrent['name'])}"
+            return _HASH_RESUMED_TMPL.format_map(
+                {"name": _fast_escape(torrent["name"])}
+            )
         return "Failed to resume torrent."
 
     def delete_by_hash(self, torrent_hash: str, delete_files: bool = True) -> str:
@@ -618,30 +983,29 @@ class TorrentManager:
             self.qbt_client.torrents_delete(
                 torrent_hashes=torrent["hash"], delete_files=delete_files
             )
-            return f"🗑️ Deleted: {html.escape(torrent['name'])}"
+            return _HASH_DELETED_TMPL.format_map(
+                {"name": _fast_escape(torrent["name"])}
+            )
         except Exception as e:
             if _check_403(e):
                 return "Failed to connect to qBittorrent."
             logger.exception("delete_by_hash failed")
-            return f"Failed to delete torrent: {e}"
+            return f"Failed to delete torrent: {_fast_escape(str(e))}"
 
     def info_by_hash(self, torrent_hash: str) -> str:
         """Get info about a torrent by its hash."""
         torrent = self._find_by_hash(torrent_hash)
         if not torrent:
             return "Torrent not found."
-        name = html.escape(torrent["name"])
-        state = html.escape(torrent["state"])
-        progress = torrent["progress"] * 100
-        size = fmt_bytes_compact_decimal(torrent.get("size", 0) or 0)
-        dlspeed = (torrent.get("dlspeed", 0) or 0) / 1024.0
-        upspeed = (torrent.get("upspeed", 0) or 0) / 1024.0
-        return (
-            f"<b>{name}</b>\n"
-            f"Status: {state}\n"
-            f"Progress: {progress:.1f}%\n"
-            f"Size: {size}\n"
-            f"↓ {dlspeed:.1f} KiB/s | ↑ {upspeed:.1f} KiB/s"
+        return _INFO_TMPL.format_map(
+            {
+                "name": _fast_escape(torrent["name"]),
+                "state": _fast_escape(torrent["state"]),
+                "progress": torrent["progress"] * 100,
+                "size": fmt_bytes_compact_decimal(torrent.get("size", 0) or 0),
+                "dlspeed": (torrent.get("dlspeed", 0) or 0) / 1024.0,
+                "upspeed": (torrent.get("upspeed", 0) or 0) / 1024.0,
+            }
         )
 
     def find_missing_files_torrents(self) -> list[dict]:
@@ -656,15 +1020,11 @@ class TorrentManager:
             torrents = self.qbt_client.torrents_info() or []
             matches: list[dict] = []
             for t in torrents:
-                state = str(getattr(t, "state", "")).lower()
-                # qBittorrent uses 'missingFiles' or 'missing_files' depending on version
-                if "missingfiles" in state or "missing" in state:
-                    tname = getattr(t, "name", "") or ""
-                    thash = (
-                        getattr(t, "hash", None)
-                        or getattr(t, "info_hash", None)
-                        or getattr(t, "hashString", None)
-                    )
+                get = _reader(t)
+                state = str(get("state", "")).casefold()
+                if state in _MISSING_STATES:
+                    tname = get("name", "") or ""
+                    thash = _torrent_hash(t)
                     matches.append({"name": tname, "hash": thash, "state": state})
             return matches
         except Exception as exc:
@@ -679,7 +1039,7 @@ class TorrentManager:
             return "No torrents with missing files found."
         lines = ["<b>Torrents with missing files:</b>"]
         for m in matches[:25]:
-            name = html.escape(m.get("name", "unknown"))
+            name = _fast_escape(m.get("name", "unknown"))
             lines.append(f"• <code>{name}</code>")
         if len(matches) > 25:
             lines.append(f"<i>...and {len(matches) - 25} more</i>")
@@ -699,12 +1059,10 @@ class TorrentManager:
             return "Found matching torrents but could not determine their hashes."
         ok = self._call_delete(hashes, delete_files=delete_files)
         if ok:
-            count = len(matches)
             names = ", ".join(m["name"] for m in matches[:5])
             if len(matches) > 5:
                 names += f", ... (+{len(matches) - 5} more)"
-            return (
-                f"🗑️ Cleaned {count} torrent(s) with missing files:\n"
-                f"{html.escape(names)}"
+            return _CLEANED_TMPL.format_map(
+                {"count": len(matches), "names": _fast_escape(names)}
             )
         return "Failed to delete torrents."
@@ -11,13 +11,15 @@ import asyncio
 import html
 import logging
 import os
+import random
 import re
-import secrets
+import threading
 import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
-from collections.abc import Callable
-from urllib.parse import quote, unquote
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from urllib.parse import parse_qs, quote, unquote
 
 import httpx
 
@@ -29,10 +31,21 @@ except ImportError:
     cloudscraper = None  # type: ignore
     CLOUDSCRAPER_AVAILABLE = False
 
+try:
+    import re2
+except ImportError:
+    re2 = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 # Cache configuration
 _SEARCH_CACHE_TTL_S = 300  # 5 minutes
+_EMPTY_CACHE_TTL_S = 30  # "no results" answers expire sooner
 _SEARCH_CACHE_MAX = 50
 
 # Cache: query -> (timestamp, results)
@@ -44,8 +57,13 @@ _forced_provider: str | None = None  # Force a specific provider (by name)
 _disabled_providers: set[str] = set()  # Disabled provider names
 _last_used_provider: str | None = None  # Track which provider was used last
 _provider_failures: dict[str, str] = {}  # Track last failure message per provider
+# get_enabled_sources() result; reset whenever the provider settings change
+_enabled_sources: list[TorrentSource] | None = None
 
 _CLIENT: httpx.AsyncClient | None = None
+# requests.Session is not thread-safe, so each to_thread worker keeps its own
+_CLOUDSCRAPER_LOCAL = threading.local()
+_CLOUDSCRAPER_FAILED = False  # create_scraper raised; do not retry
 
 
 def _get_client() -> httpx.AsyncClient:
@@ -58,6 +76,10 @@ def _get_client() -> httpx.AsyncClient:
     return _CLIENT
 
 
+def _cache_ttl(results: list[TorrentResult]) -> float:
+    return _SEARCH_CACHE_TTL_S if results else _EMPTY_CACHE_TTL_S
+
+
 def _cache_get(
     cache: OrderedDict[str, tuple[float, list[TorrentResult]]], key: str
 ) -> list[TorrentResult] | None:
@@ -66,7 +88,7 @@ def _cache_get(
     if not entry:
         return None
     timestamp, results = entry
-    if (time.monotonic() - timestamp) > _SEARCH_CACHE_TTL_S:
+    if (time.monotonic() - timestamp) > _cache_ttl(results):
         cache.pop(key, None)
         return None
     # Move to end (LRU)
@@ -84,7 +106,7 @@ def _cache_set(
     cache[key] = (now, results)
     cache.move_to_end(key)
     # Prune expired and over-limit entries
-    stale_keys = [k for k, (ts, _) in cache.items() if (now - ts) > _SEARCH_CACHE_TTL_S]
+    stale_keys = [k for k, (ts, r) in cache.items() if (now - ts) > _cache_ttl(r)]
     for k in stale_keys:
         cache.pop(k, None)
     while len(cache) > _SEARCH_CACHE_MAX:
@@ -104,14 +126,16 @@ def get_forced_provider() -> str | None:
 
 def set_forced_provider(name: str | None) -> bool:
     """Set forced provider by name. Returns True if valid provider found."""
-    global _forced_provider
+    global _forced_provider, _enabled_sources
     if name is None:
         _forced_provider = None
+        _enabled_sources = None
         return True
     name_lower = name.lower()
     for source in SOURCES:
         if source.name.lower() == name_lower:
             _forced_provider = source.name
+            _enabled_sources = None
             return True
     return False
 
@@ -123,10 +147,11 @@ def get_disabled_providers() -> set[str]:
 
 def toggle_provider(name: str) -> tuple[bool, bool]:
     """Toggle a provider on/off. Returns (found, now_enabled)."""
-    global _disabled_providers
+    global _disabled_providers, _enabled_sources
     name_lower = name.lower()
     for source in SOURCES:
         if source.name.lower() == name_lower:
+            _enabled_sources = None
             if source.name in _disabled_providers:
                 _disabled_providers.discard(source.name)
                 return True, True
@@ -188,29 +213,39 @@ TRACKERS = [
     "udp://p4p.arenabg.com:1337/announce",
     "udp://tracker.dler.org:6969/announce",
 ]
+# Pre-encoded "&tr=..." tail shared by every magnet built from a bare hash
+_TRACKER_SUFFIX = "".join(f"&tr={quote(t, safe='')}" for t in TRACKERS)
+
+
+# User-agent rotation is not security sensitive; a private PRNG avoids an
+# os.urandom call per request
+_UA_RNG = random.Random()  # noqa: S311  # nosec B311
 
 
 def _get_random_user_agent() -> str:
     """Return a random user agent for request spoofing."""
-    return secrets.choice(USER_AGENTS)
+    return _UA_RNG.choice(USER_AGENTS)
+
+
+# Browser headers shared by every request; only User-Agent/Referer vary
+_BROWSER_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Cache-Control": "max-age=0",
+}
 
 
 def _build_browser_headers(referer: str | None = None) -> dict[str, str]:
     """Build headers that mimic a real browser."""
-    headers = {
-        "User-Agent": _get_random_user_agent(),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "DNT": "1",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-        "Cache-Control": "max-age=0",
-    }
+    headers = {"User-Agent": _get_random_user_agent(), **_BROWSER_HEADERS}
     if referer:
         headers["Referer"] = referer
     return headers
@@ -218,9 +253,85 @@ def _build_browser_headers(referer: str | None = None) -> dict[str, str]:
 
 def _build_magnet(info_hash: str, name: str) -> str:
     """Build a magnet link from info hash and name."""
-    dn = quote(name, safe="")
-    trackers = "".join(f"&tr={quote(t, safe='')}" for t in TRACKERS)
-    return f"magnet:?xt=urn:btih:{info_hash}&dn={dn}{trackers}"
+    return f"magnet:?xt=urn:btih:{info_hash}&dn={quote(name, safe='')}{_TRACKER_SUFFIX}"
+
+
+def _fast_unescape(text: str) -> str:
+    """Decode HTML entities in a magnet href, skipping the work when there are none.
+
+    Magnet links always contain bare `&` parameter separators, which
+    `html.unescape` would inspect one by one; in href attributes these sites
+    only ever escape them as `&amp;` or numeric references.  Link text can
+    carry any named entity, so names go through `html.unescape` directly.
+    """
+    if "&amp;" in text or "&#" in text:
+        return html.unescape(text)
+    return text
+
+
+def _extract_btih(magnet: str) -> str | None:
+    """Return the upper-cased info-hash following `btih:` in a magnet link."""
+    start = magnet.find("btih:")
+    if start < 0:
+        return None
+    start += 5
+    end = magnet.find("&", start)
+    return (magnet[start:end] if end >= 0 else magnet[start:]).upper() or None
+
+
+def _cf_blocked(text: str) -> bool:
+    """Return True if *text* is a Cloudflare challenge page.
+
+    The markers sit in the page `<head>`, so only the first 4 KB is checked.
+    """
+    head = text[:4096].lower()
+    return "just a moment" in head or "cf-chl" in head
+
+
+def _compile_scan(pattern: str):
+    """Compile a page-wide card/row pattern, using google-re2 when installed.
+
+    re2 matches in linear time, so the lazy `(.*?)` scans over whole pages
+    cannot backtrack badly.  Flags must be inline (e.g. `(?is)`) so the same
+    source works with both engines.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception:  # pragma: no cover - syntax re2 does not support
+            logger.debug("re2 rejected pattern, using re: %s", pattern)
+    return re.compile(pattern)
+
+
+def _get_cloudscraper_session():
+    """Return the calling thread's cloudscraper session, creating it on first use.
+
+    Fetches run concurrently in `asyncio.to_thread` workers, so each worker
+    thread gets its own session rather than sharing one `requests.Session`.
+    Reusing it keeps the Cloudflare clearance cookies and pooled connections
+    across that thread's requests.  Returns None, without retrying, once
+    creating a session has failed.
+    """
+    global _CLOUDSCRAPER_FAILED
+    if _CLOUDSCRAPER_FAILED:
+        return None
+    session = getattr(_CLOUDSCRAPER_LOCAL, "session", None)
+    if session is None:
+        try:
+            session = cloudscraper.create_scraper(
+                browser={
+                    "browser": "chrome",
+                    "platform": "windows",
+                    "desktop": True,
+                },
+                delay=5,
+            )
+        except Exception as exc:
+            _CLOUDSCRAPER_FAILED = True
+            logger.warning("cloudscraper unavailable: %s", exc)
+            return None
+        _CLOUDSCRAPER_LOCAL.session = session
+    return session
 
 
 async def _fetch_with_cloudscraper(
@@ -233,30 +344,24 @@ async def _fetch_with_cloudscraper(
     Uses asyncio.to_thread as cloudscraper is synchronous.
     Returns HTML content or None if failed.
     """
-    if not CLOUDSCRAPER_AVAILABLE:
+    if not CLOUDSCRAPER_AVAILABLE or _CLOUDSCRAPER_FAILED:
         return None
 
     def _sync_fetch():
         try:
-            scraper = cloudscraper.create_scraper(
-                browser={
-                    "browser": "chrome",
-                    "platform": "windows",
-                    "desktop": True,
-                },
-                delay=5,
-            )
+            scraper = _get_cloudscraper_session()
+            if scraper is None:
+                return None
             headers = _build_browser_headers(referer)
             resp = scraper.get(url, headers=headers, timeout=timeout)
             resp.raise_for_status()
 
-            # Check if still blocked
-            text = resp.text
-            if "just a moment" in text.lower() or "cf-chl" in text.lower():
+            # Check if still blocked; only the head needs decoding for that
+            if _cf_blocked(resp.content[:4096].decode("utf-8", "ignore")):
                 logger.debug("cloudscraper: still blocked by Cloudflare for %s", url)
                 return None
 
-            return text
+            return resp.text
         except Exception as exc:
             logger.debug("cloudscraper fetch failed for %s: %s", url, exc)
             return None
@@ -264,24 +369,16 @@ async def _fetch_with_cloudscraper(
     return await asyncio.to_thread(_sync_fetch)
 
 
+@dataclass(slots=True, frozen=True)
 class TorrentResult:
     """Standardized torrent result across all sources."""
 
-    def __init__(
-        self,
-        name: str,
-        magnet: str,
-        seeders: int,
-        leechers: int,
-        source: str,
-        size: str | None = None,
-    ):
-        self.name = name
-        self.magnet = magnet
-        self.seeders = seeders
-        self.leechers = leechers
-        self.source = source
-        self.size = size
+    name: str
+    magnet: str
+    seeders: int
+    leechers: int
+    source: str
+    size: str | None = None
 
     def to_dict(self) -> dict[str, object]:
         return {
@@ -322,6 +419,19 @@ class BitSearchSource(TorrentSource):
     name = "BitSearch"
     base_url = os.environ.get("BITSEARCH_BASE_URL", "https://bitsearch.to")
 
+    # Search terms standing in for a "top" listing, by lowercase category
+    _CATEGORY_TERMS = {
+        "movies": "1080p",
+        "video": "1080p",
+        "hdmovies": "2160p 4k",
+        "tv": "S01E01",
+        "hdtv": "720p HDTV",
+        "music": "FLAC",
+        "audio": "MP3 320",
+        "games": "PC game",
+        "apps": "software",
+    }
+    _DN_PREFIX = "[bitsearch.to]"
     _MAGNET_RE = re.compile(r'href="(magnet:\?[^"]+)"', re.IGNORECASE)
     _SEEDERS_RE = re.compile(
         r'text-green-600">\s*<i[^>]*></i>\s*'
@@ -344,12 +454,14 @@ class BitSearchSource(TorrentSource):
         return resp.text
 
     def _extract_name_from_magnet(self, magnet: str) -> str:
-        match = re.search(r"dn=([^&]+)", magnet)
-        if match:
-            name = unquote(match.group(1))
-            name = re.sub(r"^\[Bitsearch\.to\]\s*", "", name, flags=re.IGNORECASE)
-            return name
-        return "Unknown"
+        names = parse_qs(magnet.partition("?")[2]).get("dn")
+        if not names:
+            return "Unknown"
+        name = names[0]
+        # The site tags names with its domain in varying case
+        if name[: len(self._DN_PREFIX)].lower() == self._DN_PREFIX:
+            name = name[len(self._DN_PREFIX) :].lstrip()
+        return name
 
     def _parse_results(self, html_text: str) -> list[TorrentResult]:
         results: list[TorrentResult] = []
@@ -357,37 +469,30 @@ class BitSearchSource(TorrentSource):
         seeders_matches = list(self._SEEDERS_RE.finditer(html_text))
         leechers_matches = list(self._LEECHERS_RE.finditer(html_text))
 
+        # All three lists are in document order, so one forward cursor per
+        # list finds the first seeders/leechers block after each magnet.
+        si = li = 0
+        n_seeders = len(seeders_matches)
+        n_leechers = len(leechers_matches)
         seen_hashes: set[str] = set()
         for magnet_match in magnets:
-            magnet = html.unescape(magnet_match.group(1))
-            hash_match = re.search(r"btih:([a-fA-F0-9]+)", magnet)
-            if not hash_match:
+            pos = magnet_match.start()
+            while si < n_seeders and seeders_matches[si].start() <= pos:
+                si += 1
+            while li < n_leechers and leechers_matches[li].start() <= pos:
+                li += 1
+            magnet = _fast_unescape(magnet_match.group(1))
+            info_hash = _extract_btih(magnet)
+            if not info_hash:
                 continue
-            info_hash = hash_match.group(1).upper()
             if info_hash in seen_hashes:
                 continue
             seen_hashes.add(info_hash)
-            name = self._extract_name_from_magnet(magnet)
-            pos = magnet_match.start()
-            seeders = 0
-            leechers = 0
-            for sm in seeders_matches:
-                if sm.start() > pos:
-                    try:
-                        seeders = int(sm.group(1))
-                    except ValueError:
-                        pass
-                    break
-            for lm in leechers_matches:
-                if lm.start() > pos:
-                    try:
-                        leechers = int(lm.group(1))
-                    except ValueError:
-                        pass
-                    break
+            seeders = int(seeders_matches[si].group(1)) if si < n_seeders else 0
+            leechers = int(leechers_matches[li].group(1)) if li < n_leechers else 0
             results.append(
                 TorrentResult(
-                    name=name,
+                    name=self._extract_name_from_magnet(magnet),
                     magnet=magnet,
                     seeders=seeders,
                     leechers=leechers,
@@ -417,19 +522,7 @@ class BitSearchSource(TorrentSource):
     async def top(
         self, category: str | None = None, debug_sink: Callable | None = None
     ) -> list[TorrentResult]:
-        category_terms = {
-            "movies": "1080p",
-            "video": "1080p",
-            "hdmovies": "2160p 4k",
-            "tv": "S01E01",
-            "hdtv": "720p HDTV",
-            "music": "FLAC",
-            "audio": "MP3 320",
-            "games": "PC game",
-            "apps": "software",
-            None: "2024",
-        }
-        term = category_terms.get(category, category_terms[None])
+        term = self._CATEGORY_TERMS.get((category or "").lower(), "2024")
         return await self.search(term, debug_sink)
 
 
@@ -447,6 +540,9 @@ class EZTVSource(TorrentSource):
         client = _get_client()
         resp = await client.get(url, headers=headers)
         resp.raise_for_status()
+        # orjson parses straight from the response bytes when installed
+        if orjson is not None:
+            return orjson.loads(resp.content)
         return resp.json()
 
     def _parse_results(self, data: dict) -> list[TorrentResult]:
@@ -533,11 +629,23 @@ class X1337Source(TorrentSource):
     enabled = CLOUDSCRAPER_AVAILABLE
     base_url = os.environ.get("X1337_BASE_URL", "https://1337x.to")
 
-    _ROW_RE = re.compile(r"<tr[^>]*>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+    _ROW_RE = _compile_scan(r"(?is)<tr[^>]*>(.*?)</tr>")
     _NAME_RE = re.compile(r'/torrent/\d+/([^/"]+)/', re.IGNORECASE)
     _SEEDS_RE = re.compile(r'<td class="seeds">(\d+)</td>', re.IGNORECASE)
     _LEECHES_RE = re.compile(r'<td class="leeches">(\d+)</td>', re.IGNORECASE)
     _DETAIL_LINK_RE = re.compile(r'<a href="(/torrent/[^"]+)"', re.IGNORECASE)
+    _MAGNET_RE = re.compile(r'href="(magnet:\?[^"]+)"')
+    # Top-100 listing path by lowercase category
+    _CATEGORY_PATHS = {
+        "movies": "/top-100-movies",
+        "video": "/top-100-movies",
+        "tv": "/top-100-television",
+        "hdtv": "/top-100-television",
+        "music": "/top-100-music",
+        "audio": "/top-100-music",
+        "games": "/top-100-games",
+        "apps": "/top-100-applications",
+    }
 
     async def _fetch(self, url: str) -> str:
         html_text = await _fetch_with_cloudscraper(
@@ -554,21 +662,38 @@ class X1337Source(TorrentSource):
     async def _get_magnet_from_detail_page(self, detail_url: str) -> str | None:
         try:
             html_text = await self._fetch(detail_url)
-            magnet_match = re.search(r'href="(magnet:\?[^"]+)"', html_text)
+            magnet_match = self._MAGNET_RE.search(html_text)
             if magnet_match:
-                return html.unescape(magnet_match.group(1))
+                return _fast_unescape(magnet_match.group(1))
         except Exception as exc:
             logger.debug("1337x detail page fetch failed: %s", exc)
         return None
 
+    async def _resolve_magnets(self, items: list[dict]) -> list[TorrentResult]:
+        """Fetch detail pages concurrently; keep the items that have a magnet."""
+        magnets = await asyncio.gather(
+            *(self._get_magnet_from_detail_page(item["detail_url"]) for item in items)
+        )
+        return [
+            TorrentResult(
+                name=item["name"],
+                magnet=magnet,
+                seeders=item["seeders"],
+                leechers=item["leechers"],
+                source=self.name,
+            )
+            for item, magnet in zip(items, magnets, strict=True)
+            if magnet
+        ]
+
     def _parse_search_results(self, html_text: str) -> list[dict]:
         results: list[dict] = []
         for row in self._ROW_RE.findall(html_text):
             detail_match = self._DETAIL_LINK_RE.search(row)
-            seeds_match = self._SEEDS_RE.search(row)
-            leeches_match = self._LEECHES_RE.search(row)
             if not detail_match:
                 continue
+            seeds_match = self._SEEDS_RE.search(row)
+            leeches_match = self._LEECHES_RE.search(row)
             detail_path = detail_match.group(1)
             name_match = self._NAME_RE.search(detail_path)
             name = unquote(name_match.group(1)).replace("-", " ") if name_match else ""
@@ -599,26 +724,13 @@ class X1337Source(TorrentSource):
         url = f"{self.base_url}/search/{quote(q)}/1/"
         try:
             html_text = await self._fetch(url)
-            if "just a moment" in html_text.lower() or "cf-chl" in html_text.lower():
+            if _cf_blocked(html_text):
                 raise RuntimeError("1337x blocked by Cloudflare")
             partial_results = self._parse_search_results(html_text)
             partial_results = sorted(
                 partial_results, key=lambda r: r["seeders"], reverse=True
             )[:10]
-            results: list[TorrentResult] = []
-            for item in partial_results:
-                magnet = await self._get_magnet_from_detail_page(item["detail_url"])
-                if magnet:
-                    results.append(
-                        TorrentResult(
-                            name=item["name"],
-                            magnet=magnet,
-                            seeders=item["seeders"],
-                            leechers=item["leechers"],
-                            source=self.name,
-                        )
-                    )
-            return results
+            return await self._resolve_magnets(partial_results)
         except Exception as exc:
             logger.debug("1337x search failed: %s", exc)
             if debug_sink:
@@ -630,38 +742,14 @@ class X1337Source(TorrentSource):
     ) -> list[TorrentResult]:
         if not self.enabled:
             return []
-        category_paths = {
-            "movies": "/top-100-movies",
-            "video": "/top-100-movies",
-            "tv": "/top-100-television",
-            "hdtv": "/top-100-television",
-            "music": "/top-100-music",
-            "audio": "/top-100-music",
-            "games": "/top-100-games",
-            "apps": "/top-100-applications",
-            None: "/top-100",
-        }
-        path = category_paths.get(category, category_paths[None])
+        path = self._CATEGORY_PATHS.get((category or "").lower(), "/top-100")
         url = f"{self.base_url}{path}"
         try:
             html_text = await self._fetch(url)
-            if "just a moment" in html_text.lower() or "cf-chl" in html_text.lower():
+            if _cf_blocked(html_text):
                 raise RuntimeError("1337x blocked by Cloudflare")
             partial_results = self._parse_search_results(html_text)[:10]
-            results: list[TorrentResult] = []
-            for item in partial_results:
-                magnet = await self._get_magnet_from_detail_page(item["detail_url"])
-                if magnet:
-                    results.append(
-                        TorrentResult(
-                            name=item["name"],
-                            magnet=magnet,
-                            seeders=item["seeders"],
-                            leechers=item["leechers"],
-                            source=self.name,
-                        )
-                    )
-            return results
+            return await self._resolve_magnets(partial_results)
         except Exception as exc:
             logger.debug("1337x top failed: %s", exc)
             if debug_sink:
@@ -676,10 +764,7 @@ class LimeTorrentsSource(TorrentSource):
     enabled = CLOUDSCRAPER_AVAILABLE
     base_url = os.environ.get("LIMETORRENTS_BASE_URL", "https://www.limetorrents.lol")
 
-    _ROW_RE = re.compile(
-        r'<tr[^>]*class="[^"]*"[^>]*>(.*?)</tr>',
-        re.IGNORECASE | re.DOTALL,
-    )
+    _ROW_RE = _compile_scan(r'(?is)<tr[^>]*class="[^"]*"[^>]*>(.*?)</tr>')
     _NAME_LINK_RE = re.compile(
         r'<a href="([^"]+)"[^>]*class="[^"]*coll-1[^"]*"[^>]*>([^<]+)</a>',
         re.IGNORECASE,
@@ -693,6 +778,18 @@ class LimeTorrentsSource(TorrentSource):
         re.IGNORECASE,
     )
     _HASH_RE = re.compile(r"/([a-fA-F0-9]{40})\.torrent", re.IGNORECASE)
+    # Browse listing path by lowercase category
+    _CATEGORY_PATHS = {
+        "movies": "/browse-torrents/Movies/",
+        "video": "/browse-torrents/Movies/",
+        "tv": "/browse-torrents/TV-shows/",
+        "hdtv": "/browse-torrents/TV-shows/",
+        "music": "/browse-torrents/Music/",
+        "audio": "/browse-torrents/Music/",
+        "games": "/browse-torrents/Games/",
+        "apps": "/browse-torrents/Applications/",
+        "anime": "/browse-torrents/Anime/",
+    }
 
     async def _fetch(self, url: str) -> str:
         html_text = await _fetch_with_cloudscraper(
@@ -709,16 +806,18 @@ class LimeTorrentsSource(TorrentSource):
     def _parse_results(self, html_text: str) -> list[TorrentResult]:
         results: list[TorrentResult] = []
         for row in self._ROW_RE.findall(html_text):
+            # Rows without a name link or hash (headers, ads) are skipped
+            # before the count cells are searched
             name_match = self._NAME_LINK_RE.search(row)
-            seeds_match = self._SEEDS_RE.search(row)
-            leeches_match = self._LEECHES_RE.search(row)
             if not name_match:
                 continue
-            name = html.unescape(name_match.group(2).strip())
             hash_match = self._HASH_RE.search(row)
             if not hash_match:
                 continue
+            name = html.unescape(name_match.group(2).strip())
             info_hash = hash_match.group(1).upper()
+            seeds_match = self._SEEDS_RE.search(row)
+            leeches_match = self._LEECHES_RE.search(row)
             try:
                 seeders = int(seeds_match.group(1)) if seeds_match else 0
                 leechers = int(leeches_match.group(1)) if leeches_match else 0
@@ -748,7 +847,7 @@ class LimeTorrentsSource(TorrentSource):
         url = f"{self.base_url}/search/all/{quote(q)}/"
         try:
             html_text = await self._fetch(url)
-            if "just a moment" in html_text.lower() or "cf-chl" in html_text.lower():
+            if _cf_blocked(html_text):
                 raise RuntimeError("LimeTorrents blocked by Cloudflare")
             results = self._parse_results(html_text)
             results = sorted(results, key=lambda r: r.seeders, reverse=True)[:10]
@@ -764,23 +863,11 @@ class LimeTorrentsSource(TorrentSource):
     ) -> list[TorrentResult]:
         if not self.enabled:
             return []
-        category_paths = {
-            "movies": "/browse-torrents/Movies/",
-            "video": "/browse-torrents/Movies/",
-            "tv": "/browse-torrents/TV-shows/",
-            "hdtv": "/browse-torrents/TV-shows/",
-            "music": "/browse-torrents/Music/",
-            "audio": "/browse-torrents/Music/",
-            "games": "/browse-torrents/Games/",
-            "apps": "/browse-torrents/Applications/",
-            "anime": "/browse-torrents/Anime/",
-            None: "/top100",
-        }
-        path = category_paths.get(category, category_paths[None])
+        path = self._CATEGORY_PATHS.get((category or "").lower(), "/top100")
         url = f"{self.base_url}{path}"
         try:
             html_text = await self._fetch(url)
-            if "just a moment" in html_text.lower() or "cf-chl" in html_text.lower():
+            if _cf_blocked(html_text):
                 raise RuntimeError("LimeTorrents blocked by Cloudflare")
             results = self._parse_results(html_text)
             results = sorted(results, key=lambda r: r.seeders, reverse=True)[:10]
@@ -801,7 +888,13 @@ SOURCES: list[TorrentSource] = [
 
 
 def get_enabled_sources() -> list[TorrentSource]:
-    global _forced_provider
+    global _enabled_sources
+    if _enabled_sources is None:
+        _enabled_sources = _compute_enabled_sources()
+    return _enabled_sources
+
+
+def _compute_enabled_sources() -> list[TorrentSource]:
     if _forced_provider:
         for source in SOURCES:
             if source.name == _forced_provider:
@@ -811,51 +904,72 @@ def get_enabled_sources() -> list[TorrentSource]:
     return [s for s in SOURCES if s.enabled and s.name not in _disabled_providers]
 
 
+async def _first_non_empty(
+    calls: list[tuple[TorrentSource, Awaitable[list[TorrentResult]]]],
+    debug_sink: Callable | None = None,
+) -> list[TorrentResult]:
+    """Run source calls concurrently and return the first non-empty result.
+
+    Sources finishing in the same loop iteration are taken in `SOURCES`
+    order; the remaining calls are cancelled once a winner is found.
+    """
+    global _last_used_provider
+    tasks = {
+        asyncio.ensure_future(call): (order, source)
+        for order, (source, call) in enumerate(calls)
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in sorted(done, key=lambda t: tasks[t][0]):
+                source = tasks[task][1]
+                try:
+                    results = task.result()
+                except Exception as exc:
+                    logger.debug("fallback source %s failed: %s", source.name, exc)
+                    _provider_failures[source.name] = str(exc)
+                    if debug_sink:
+                        debug_sink(f"fallback {source.name} failed", str(exc))
+                    continue
+                if results:
+                    _last_used_provider = source.name
+                    _provider_failures.pop(source.name, None)
+                    return results
+    finally:
+        for task in pending:
+            task.cancel()
+    _last_used_provider = None
+    return []
+
+
 async def fallback_search(
     query: str, debug_sink: Callable | None = None
 ) -> list[TorrentResult]:
-    global _last_used_provider, _provider_failures
     cache_key = query.strip().lower()
     cached = _cache_get(_search_cache, cache_key)
     if cached is not None:
         return cached
-    for source in get_enabled_sources():
-        try:
-            results = await source.search(query, debug_sink)
-            if results:
-                _last_used_provider = source.name
-                _provider_failures.pop(source.name, None)
-                _cache_set(_search_cache, cache_key, results)
-                return results
-        except Exception as exc:
-            logger.debug("fallback source %s failed: %s", source.name, exc)
-            _provider_failures[source.name] = str(exc)
-            if debug_sink:
-                debug_sink(f"fallback {source.name} failed", str(exc))
-    _last_used_provider = None
-    return []
+    results = await _first_non_empty(
+        [(s, s.search(query, debug_sink)) for s in get_enabled_sources()],
+        debug_sink,
+    )
+    _cache_set(_search_cache, cache_key, results)
+    return results
 
 
 async def fallback_top(
     category: str | None = None, debug_sink: Callable | None = None
 ) -> list[TorrentResult]:
-    global _last_used_provider, _provider_failures
     cache_key = f"top:{category or 'all'}"
     cached = _cache_get(_top_cache, cache_key)
     if cached is not None:
         return cached
-    for source in get_enabled_sources():
-        try:
-            results = await source.top(category, debug_sink)
-            if results:
-                _last_used_provider = source.name
-                _provider_failures.pop(source.name, None)
-                _cache_set(_top_cache, cache_key, results)
-                return results
-        except Exception as exc:
-            logger.debug("fallback source %s failed: %s", source.name, exc)
-            _provider_failures[source.name] = str(exc)
-            if debug_sink:
-                debug_sink(f"fallback {source.name} failed", str(exc))
-    _last_used_provider = None
-    return []
+    results = await _first_non_empty(
+        [(s, s.top(category, debug_sink)) for s in get_enabled_sources()],
+        debug_sink,
+    )
+    _cache_set(_top_cache, cache_key, results)
+    return results
@@ -7,17 +7,22 @@ Presentation logic is handled by the view layer.
 from __future__ import annotations
 
 import asyncio
+import heapq
+import ipaddress
 import logging
 import os
 import platform
-import re
-import shutil
 import socket
+import struct
+import sys
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 import docker
+import httpx
 import psutil
 
 from . import cli
@@ -27,11 +32,81 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# The public IP changes rarely; keep it for a few minutes instead of querying
+# an external service on every /status.
+_WAN_TTL_S = 300.0
+# If every service fails, keep reporting the last good answer for up to an hour.
+_WAN_STALE_S = 3600.0
+_wan_ip_cache: tuple[str, float] | None = None
+_wan_ip_lock = asyncio.Lock()
+_WAN_IP_URLS = (
+    "https://checkip.amazonaws.com",
+    "https://ipinfo.io/ip",
+    "https://ifconfig.me/ip",
+)
+
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(3.0),
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client used for WAN IP lookups and speedtests."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        client, _HTTP_CLIENT = _HTTP_CLIENT, None
+        await client.aclose()
+
+
+# psutil.cpu_percent(interval=None) reports usage since the previous call
+# without sleeping. That is only a "current" reading if the previous call was
+# recent, so a stale baseline is replaced by a short blocking sample, and
+# calls that come too close together reuse the last reading.
+_CPU_MIN_INTERVAL_S = 0.5
+_CPU_STALE_S = 5.0
+_CPU_SAMPLE_S = 0.2
+_LAST_CPU_PCT = 0.0
+_LAST_CPU_TS = float("-inf")
+
+# A UI refresh usually asks for both the container table and the name set; share
+# one containers.list() round trip between them.
+_CONTAINERS_TTL_S = 1.0
+_containers_cache: tuple[float, list[Any]] = (0.0, [])
+_containers_lock = asyncio.Lock()
+
+# Serve repeated /dstats and per-container lookups from a short-lived snapshot
+# instead of re-querying the daemon for every container.
+_STATS_TTL_S = 5.0
+_STATS_WORKERS = 8
+_STATS_CACHE: list[dict[str, str]] = []
+_STATS_TS = 0.0
+_stats_lock = asyncio.Lock()
+# One-shot stats skip the daemon's second CPU sample, so CPU% is measured
+# against the previous pass: container id -> (container total, system total).
+_CPU_BASELINES: dict[str, tuple[int, int]] = {}
+
 # docker client (shared, initialized lazily so importing the app does not require
 # a mounted Docker socket)
 client: DockerClient | None = None
 
 
+async def _to_thread(func: Callable[..., Any], *args: Any) -> Any:
+    """Like ``asyncio.to_thread`` without copying the caller's context.
+
+    None of the blocking helpers offloaded from this module read contextvars,
+    so the per-call ``copy_context()`` and ``partial`` wrapping are skipped.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
 def _get_docker_client() -> DockerClient:
     global client
     if client is None:
@@ -39,6 +114,10 @@ def _get_docker_client() -> DockerClient:
     return client
 
 
+_BYTE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+_BYTE_DIVISORS = (1, 1 << 10, 1 << 20, 1 << 30, 1 << 40)
+
+
 def fmt_bytes(n: int) -> str:
     """Format bytes to human readable string using binary units (e.g. 1.2 GiB).
 
@@ -54,20 +133,40 @@ def fmt_bytes(n: int) -> str:
         >>> fmt_bytes(1073741824)
         '1.0 GiB'
     """
-    units = ["B", "KiB", "MiB", "GiB", "TiB"]
-    i = 0
-    f = float(n)
-    while f >= 1024 and i < len(units) - 1:
-        f /= 1024
-        i += 1
-    return f"{f:.1f} {units[i]}"
+    if n < 1024:
+        return f"{float(n):.1f} B"
+    # Each binary unit is 10 bits, so the bit length picks the unit directly.
+    i = (int(n).bit_length() - 1) // 10
+    if i > 4:
+        i = 4
+    return f"{n / _BYTE_DIVISORS[i]:.1f} {_BYTE_UNITS[i]}"
+
+
+def _route_source_ip() -> str | None:
+    """Return the source address the kernel would use to reach 1.1.1.1.
+
+    Connecting a UDP socket only selects a route; no packet is sent.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.settimeout(0.1)
+        s.connect(("1.1.1.1", 80))
+        ip = s.getsockname()[0]
+    return ip if ip and ip != "0.0.0.0" else None  # noqa: S104  # nosec B104
+
+
+def _first_interface_ip() -> str:
+    for _iface, addrs in psutil.net_if_addrs().items():
+        for a in addrs:
+            if a.family == socket.AF_INET and not a.address.startswith("127."):
+                return a.address
+    return "unknown"
 
 
 async def get_primary_ip() -> str:
     """Get the primary LAN IP address of this host.
 
-    First attempts to use `ip route` command, then falls back to psutil
-    to find the first non-loopback IPv4 address.
+    First asks the kernel which source address routes to 1.1.1.1, then
+    falls back to psutil to find the first non-loopback IPv4 address.
 
     Returns:
         IP address string, or "unknown" if not found
@@ -76,32 +175,59 @@ async def get_primary_ip() -> str:
         Prefers the IP used for routing to 1.1.1.1 to ensure we get
         the primary outbound interface.
     """
-    rc, out, err = await cli.run_cmd(
-        ["bash", "-lc", "ip route get 1.1.1.1 | awk '{print $7; exit}'"], timeout=2
-    )
-    out = out.strip()
-    if rc == 0 and out:
-        return out
-
-    try:
 
-        def _get_ip():
-            for _iface, addrs in psutil.net_if_addrs().items():
-                for a in addrs:
-                    if a.family == socket.AF_INET and not a.address.startswith("127."):
-                        return a.address
-            return "unknown"
+    def _get_ip() -> str:
+        try:
+            ip = _route_source_ip()
+        except OSError:
+            ip = None
+        if ip:
+            return ip
+        return _first_interface_ip()
 
-        return await asyncio.to_thread(_get_ip)
+    try:
+        return await _to_thread(_get_ip)
     except Exception:
-        logger.debug("primary ip via psutil failed", exc_info=True)
+        logger.debug("primary ip lookup failed", exc_info=True)
     return "unknown"
 
 
+async def _fetch_wan_ip_from(client: httpx.AsyncClient, url: str) -> str | None:
+    try:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        ip = resp.text.strip()
+        ipaddress.ip_address(ip)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.debug("WAN IP lookup via %s failed: %s", url, e)
+        return None
+    return ip
+
+
+async def _fetch_wan_ip() -> str | None:
+    """Race the WAN IP services and return the first valid answer."""
+    client = _get_http_client()
+    tasks = [
+        asyncio.create_task(_fetch_wan_ip_from(client, url)) for url in _WAN_IP_URLS
+    ]
+    try:
+        for fut in asyncio.as_completed(tasks, timeout=5):
+            ip = await fut
+            if ip:
+                return ip
+    except TimeoutError:
+        logger.debug("WAN IP lookup timed out")
+    finally:
+        for task in tasks:
+            task.cancel()
+    return None
+
+
 async def get_wan_ip() -> str:
     """Get the public WAN IP address using external services.
 
-    Tries multiple services in sequence:
+    Queries these services concurrently over a shared HTTP client and uses
+    the first valid answer:
     1. AWS checkip
     2. ipinfo.io
     3. ifconfig.me
@@ -111,36 +237,56 @@ async def get_wan_ip() -> str:
 
     Note:
         Has a 5-second timeout to avoid blocking on network issues.
+        Successful lookups are cached for ``_WAN_TTL_S`` seconds; failures
+        are not cached so the next call retries, and while they persist the
+        last good answer is returned for up to ``_WAN_STALE_S`` seconds.
     """
-    rc, out, err = await cli.run_cmd(
-        [
-            "bash",
-            "-lc",
-            "curl -fsS https://checkip.amazonaws.com || curl -fsS https://ipinfo.io/ip || curl -fsS https://ifconfig.me",
-        ],
-        timeout=5,
-    )
-    out = out.strip()
-    if rc == 0 and out:
-        return out
+    global _wan_ip_cache
+    cached = _wan_ip_cache
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
+
+    async with _wan_ip_lock:
+        # Another caller may have refreshed the value while we waited.
+        cached = _wan_ip_cache
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        ip = await _fetch_wan_ip()
+        now = time.monotonic()
+        if ip:
+            _wan_ip_cache = (ip, now + _WAN_TTL_S)
+            return ip
+        if cached is not None and now < cached[1] - _WAN_TTL_S + _WAN_STALE_S:
+            return cached[0]
     return "n/a"
 
 
+_which = cli.cached_which
+
+
+# Sensor files do not appear at runtime, so probe them once at import instead
+# of stat-ing paths on every reading.
+_THERMAL_ZONES = (
+    "/sys/class/thermal/thermal_zone0/temp",
+    "/sys/class/thermal/thermal_zone1/temp",
+)
+_TEMP_PATHS = tuple(p for p in _THERMAL_ZONES if os.path.exists(p))
+_CPU_TEMP_PATHS = tuple(
+    p for p in ("/host_thermal/temp", *_THERMAL_ZONES) if os.path.exists(p)
+)
+
+
 async def get_temp() -> str:
-    for path in [
-        "/sys/class/thermal/thermal_zone0/temp",
-        "/sys/class/thermal/thermal_zone1/temp",
-    ]:
+    for path in _TEMP_PATHS:
         try:
-            if os.path.exists(path):
-                with open(path) as f:
-                    t = f.read().strip()
-                if t and t.isdigit():
-                    return f"{int(t) / 1000:.1f}°C"
+            with open(path) as f:
+                t = f.read().strip()
+            if t and t.isdigit():
+                return f"{int(t) / 1000:.1f}°C"
         except (OSError, ValueError) as e:
             logger.debug("Error reading temp from %s: %s", path, e)
 
-    vcgencmd = shutil.which("vcgencmd")
+    vcgencmd = _which("vcgencmd")
     if vcgencmd:
         rc, out, err = await cli.run_cmd([vcgencmd, "measure_temp"], timeout=2)
         if rc == 0 and out:
@@ -153,15 +299,8 @@ async def get_cpu_temp() -> str:
     """Read CPU temperature from a mounted host path or system thermal zone."""
 
     def _read():
-        paths = [
-            "/host_thermal/temp",
-            "/sys/class/thermal/thermal_zone0/temp",
-            "/sys/class/thermal/thermal_zone1/temp",
-        ]
-        for p in paths:
+        for p in _CPU_TEMP_PATHS:
             try:
-                if not os.path.exists(p):
-                    continue
                 with open(p) as f:
                     raw = f.read().strip()
                 if not raw:
@@ -185,12 +324,45 @@ async def get_cpu_temp() -> str:
                 continue
         return "Error: Could not read temperature."
 
-    return await asyncio.to_thread(_read)
+    return await _to_thread(_read)
+
+
+def _cpu_percent() -> float:
+    global _LAST_CPU_PCT, _LAST_CPU_TS
+    age = time.monotonic() - _LAST_CPU_TS
+    if age >= _CPU_STALE_S:
+        _LAST_CPU_PCT = psutil.cpu_percent(interval=_CPU_SAMPLE_S)
+    elif age >= _CPU_MIN_INTERVAL_S:
+        _LAST_CPU_PCT = psutil.cpu_percent(interval=None)
+    else:
+        return _LAST_CPU_PCT
+    _LAST_CPU_TS = time.monotonic()
+    return _LAST_CPU_PCT
+
+
+# Host identity does not change while the bot runs.
+_UNAME = platform.uname()
+
+_last_time_str: tuple[int, str] = (0, "")
+
+
+def _local_time_str() -> str:
+    """Return the local time with zone, formatted at most once per second."""
+    global _last_time_str
+    now = int(time.time())
+    if now != _last_time_str[0]:
+        stamp = datetime.fromtimestamp(now).astimezone()
+        _last_time_str = (now, stamp.strftime("%Y-%m-%d %H:%M:%S %Z"))
+    return _last_time_str[1]
+
+
+# Boot time is fixed for the life of the process; psutil re-parses /proc/stat
+# on every boot_time() call.
+_BOOT_TIME = psutil.boot_time()
 
 
 def human_uptime() -> str:
-    boot = psutil.boot_time()
-    secs = int(time.time() - boot)
+    secs = int(time.time() - _BOOT_TIME)
     d, r = divmod(secs, 86400)
     h, r = divmod(r, 3600)
     m, _ = divmod(r, 60)
@@ -220,14 +392,14 @@ async def host_health(watch_paths: list[str] | None = None) -> dict[str, Any]:
         - disks: list of disk usage strings
 
     Note:
-        This function performs I/O operations and network requests,
-        so it may take a few seconds to complete.
+        This function performs I/O operations and network requests
+        concurrently; it takes roughly as long as the slowest probe.
     """
     if watch_paths is None:
         watch_paths = ["/", "/srv/media"]
 
     def _collect_sync():
-        cpu_pct = psutil.cpu_percent(interval=0.5)
+        cpu_pct = _cpu_percent()
         v = psutil.virtual_memory()
         try:
             load1, load5, load15 = os.getloadavg()
@@ -245,17 +417,36 @@ async def host_health(watch_paths: list[str] | None = None) -> dict[str, Any]:
                 disk_info.append(f"{path}: n/a")
         return cpu_pct, v, (load1, load5, load15), disk_info
 
-    cpu_pct, v, loads, disks = await asyncio.to_thread(_collect_sync)
+    # The probes are independent, so the wall time is the slowest one rather
+    # than the sum of the psutil sample, the temperature read and both IPs.
+    # A failing side probe degrades to its usual sentinel instead of failing
+    # the whole report.
+    sample, temp, lan_ip, wan_ip = await asyncio.gather(
+        _to_thread(_collect_sync),
+        get_temp(),
+        get_primary_ip(),
+        get_wan_ip(),
+        return_exceptions=True,
+    )
+    if isinstance(sample, BaseException):
+        raise sample
+    cpu_pct, v, loads, disks = sample
+
+    def _or_default(value: object, default: str) -> str:
+        if isinstance(value, BaseException):
+            logger.debug("host_health probe failed: %s", value)
+            return default
+        return str(value)
 
-    temp = await get_temp()
-    lan_ip = await get_primary_ip()
-    wan_ip = await get_wan_ip()
+    temp = _or_default(temp, "n/a")
+    lan_ip = _or_default(lan_ip, "unknown")
+    wan_ip = _or_default(wan_ip, "n/a")
 
     return {
-        "host": platform.node(),
-        "system": platform.system(),
-        "release": platform.release(),
-        "time": datetime.now().astimezone().strftime("%Y-%m-%d %H:%M:%S %Z"),
+        "host": _UNAME.node,
+        "system": _UNAME.system,
+        "release": _UNAME.release,
+        "time": _local_time_str(),
         "lan_ip": lan_ip,
         "wan_ip": wan_ip,
         "uptime": human_uptime(),
@@ -283,62 +474,129 @@ def _format_ports(pmap: dict[str, list[dict[str, str]] | None] | None) -> str:
     return ", ".join(items) if items else "-"
 
 
-async def list_containers_basic() -> list[dict[str, Any]]:
-    def _list():
-        try:
-            return _get_docker_client().containers.list(all=True)
-        except Exception:
-            return []
+def _summary_name(summary: dict[str, Any]) -> str | None:
+    names = summary.get("Names") or []
+    return names[0].lstrip("/") if names else None
+
+
+def _summary_image(summary: dict[str, Any]) -> str:
+    image = str(summary.get("Image") or "")
+    # Untagged images are listed by ID; show the same short form as Image.short_id.
+    if image.startswith("sha256:"):
+        return image[:17]
+    return image
+
+
+def _summary_ports(summary: dict[str, Any]) -> dict[str, list[dict[str, str]] | None]:
+    """Convert list-endpoint ports to the inspect ``NetworkSettings.Ports`` shape."""
+    pmap: dict[str, list[dict[str, str]] | None] = {}
+    for p in summary.get("Ports") or []:
+        key = f"{p.get('PrivatePort')}/{p.get('Type', 'tcp')}"
+        public = p.get("PublicPort")
+        if public is None:
+            pmap.setdefault(key, None)
+            continue
+        bindings = pmap.get(key) or []
+        bindings.append({"HostIp": p.get("IP", ""), "HostPort": str(public)})
+        pmap[key] = bindings
+    return pmap
+
+
+async def _get_containers() -> list[dict[str, Any]]:
+    """Return container summaries from ``GET /containers/json?all=1``.
+
+    The summaries already carry name, image, state and ports, so unlike
+    ``containers.list()`` this costs one daemon request rather than one
+    inspect (plus an image lookup when rendering) per container. The result
+    is reused for ``_CONTAINERS_TTL_S``.
+    """
+    global _containers_cache
+    ts, cached = _containers_cache
+    if cached and time.monotonic() - ts < _CONTAINERS_TTL_S:
+        return cached
+    async with _containers_lock:
+        ts, cached = _containers_cache
+        if cached and time.monotonic() - ts < _CONTAINERS_TTL_S:
+            return cached
+
+        def _list():
+            try:
+                return _get_docker_client().api.containers(all=True)
+            except Exception:
+                return []
+
+        cs = await _to_thread(_list)
+        _containers_cache = (time.monotonic(), cs)
+    return cs
 
-    cs = await asyncio.to_thread(_list)
+
+async def list_containers_basic() -> list[dict[str, Any]]:
+    cs = await _get_containers()
     result = []
     for c in cs:
         try:
             result.append(
                 {
-                    "name": c.name,
-                    "image": c.image.tags[0] if c.image.tags else c.image.short_id,
-                    "status": c.status,
-                    "ports": _format_ports(
-                        c.attrs.get("NetworkSettings", {}).get("Ports")
-                    ),
+                    "name": _summary_name(c),
+                    "image": _summary_image(c),
+                    "status": c["State"],
+                    "ports": _format_ports(_summary_ports(c)),
                 }
             )
         except Exception:
-            result.append({"name": getattr(c, "name", "unknown"), "error": True})
+            result.append({"name": _summary_name(c) or "unknown", "error": True})
     return result
 
 
 async def list_container_names() -> set[str]:
-    def _list():
-        try:
-            return _get_docker_client().containers.list(all=True)
-        except Exception:
-            return []
-
-    cs = await asyncio.to_thread(_list)
-    names = set()
-    for c in cs:
-        name = getattr(c, "name", None)
-        if name:
-            names.add(str(name))
-    return names
+    cs = await _get_containers()
+    return {name for c in cs if (name := _summary_name(c))}
 
 
 async def container_stats_rich() -> list[dict[str, str]]:
+    """Return per-container resource usage, cached for ``_STATS_TTL_S`` seconds.
+
+    Concurrent callers share a single collection pass.
+    """
+    global _STATS_CACHE, _STATS_TS
+    if _STATS_CACHE and time.monotonic() - _STATS_TS < _STATS_TTL_S:
+        return list(_STATS_CACHE)
+    async with _stats_lock:
+        if _STATS_CACHE and time.monotonic() - _STATS_TS < _STATS_TTL_S:
+            return list(_STATS_CACHE)
+        result = await _to_thread(_collect_container_stats)
+        _STATS_CACHE = result
+        _STATS_TS = time.monotonic()
+    return list(result)
+
+
+def _collect_container_stats() -> list[dict[str, str]]:
+    global _CPU_BASELINES
+
     def _safe_int(value: object, default: int = 0) -> int:
         try:
             return int(value)
         except Exception:
             return default
 
-    def _calc_cpu_pct(stats: dict) -> float:
+    baselines: dict[str, tuple[int, int]] = {}
+
+    def _calc_cpu_pct(cid: str, stats: dict) -> float:
         cpu_stats = stats.get("cpu_stats", {}) or {}
         pre_cpu = stats.get("precpu_stats", {}) or {}
         cpu_total = _safe_int((cpu_stats.get("cpu_usage", {}) or {}).get("total_usage"))
-        pre_total = _safe_int((pre_cpu.get("cpu_usage", {}) or {}).get("total_usage"))
         system_total = _safe_int(cpu_stats.get("system_cpu_usage"))
-        pre_system_total = _safe_int(pre_cpu.get("system_cpu_usage"))
+        baselines[cid] = (cpu_total, system_total)
+        if pre_cpu.get("system_cpu_usage"):
+            # The daemon took its own second sample (older API without one-shot).
+            pre_total = _safe_int(
+                (pre_cpu.get("cpu_usage", {}) or {}).get("total_usage")
+            )
+            pre_system_total = _safe_int(pre_cpu.get("system_cpu_usage"))
+        else:
+            pre_total, pre_system_total = _CPU_BASELINES.get(
+                cid, (cpu_total, system_total)
+            )
         cpu_delta = cpu_total - pre_total
         system_delta = system_total - pre_system_total
         num_cpus = cpu_stats.get("online_cpus")
@@ -370,49 +628,95 @@ async def container_stats_rich() -> list[dict[str, str]]:
                 write += _safe_int(entry.get("value"))
         return read, write
 
-    def _collect():
-        try:
-            containers = _get_docker_client().containers.list(all=True)
-        except Exception as e:
-            logger.debug("container stats list failed: %s", e)
-            return []
-
-        result: list[dict[str, str]] = []
-        for c in containers:
-            try:
-                stats = c.stats(stream=False)
-            except Exception as e:
-                logger.debug("container stats failed for %s: %s", c.name, e)
-                continue
+    try:
+        api = _get_docker_client().api
+        containers = api.containers(all=True)
+    except Exception as e:
+        logger.debug("container stats list failed: %s", e)
+        return []
 
-            cpu_pct = _calc_cpu_pct(stats)
-            mem_stats = stats.get("memory_stats", {}) or {}
-            mem_used = _safe_int(mem_stats.get("usage"))
-            mem_limit = _safe_int(mem_stats.get("limit"))
-            mem_pct = (mem_used / mem_limit * 100.0) if mem_limit else 0.0
-            rx, tx = _sum_network_io(stats)
-            blk_read, blk_write = _sum_block_io(stats)
-            pids = _safe_int((stats.get("pids_stats") or {}).get("current"))
-
-            mem_usage = (
-                f"{fmt_bytes(mem_used)}/{fmt_bytes(mem_limit)}"
-                if mem_limit
-                else f"{fmt_bytes(mem_used)}/-"
-            )
-            result.append(
-                {
-                    "name": getattr(c, "name", "unknown"),
-                    "cpu": f"{cpu_pct:.2f}%",
-                    "mem_pct": f"{mem_pct:.2f}%",
-                    "mem_usage": mem_usage,
-                    "netio": f"{fmt_bytes(rx)}/{fmt_bytes(tx)}",
-                    "blockio": f"{fmt_bytes(blk_read)}/{fmt_bytes(blk_write)}",
-                    "pids": str(pids),
-                }
-            )
-        return result
+    def _stats(cid: str) -> dict:
+        try:
+            return api.stats(cid, stream=False, one_shot=True)
+        except docker.errors.InvalidVersion:
+            return api.stats(cid, stream=False)
 
-    return await asyncio.to_thread(_collect)
+    def _one(c: dict[str, Any]) -> dict[str, str] | None:
+        name = _summary_name(c) or "unknown"
+        try:
+            stats = _stats(c["Id"])
+        except Exception as e:
+            logger.debug("container stats failed for %s: %s", name, e)
+            return None
+
+        cpu_pct = _calc_cpu_pct(c["Id"], stats)
+        mem_stats = stats.get("memory_stats", {}) or {}
+        mem_used = _safe_int(mem_stats.get("usage"))
+        mem_limit = _safe_int(mem_stats.get("limit"))
+        mem_pct = (mem_used / mem_limit * 100.0) if mem_limit else 0.0
+        rx, tx = _sum_network_io(stats)
+        blk_read, blk_write = _sum_block_io(stats)
+        pids = _safe_int((stats.get("pids_stats") or {}).get("current"))
+
+        mem_usage = (
+            f"{fmt_bytes(mem_used)}/{fmt_bytes(mem_limit)}"
+            if mem_limit
+            else f"{fmt_bytes(mem_used)}/-"
+        )
+        return {
+            "name": name,
+            "cpu": f"{cpu_pct:.2f}%",
+            "mem_pct": f"{mem_pct:.2f}%",
+            "mem_usage": mem_usage,
+            "netio": f"{fmt_bytes(rx)}/{fmt_bytes(tx)}",
+            "blockio": f"{fmt_bytes(blk_read)}/{fmt_bytes(blk_write)}",
+            "pids": str(pids),
+        }
+
+    if not containers:
+        _CPU_BASELINES = {}
+        return []
+    # Fan the per-container requests out so a pass costs about one round trip
+    # (or one ~1 s CPU sample on daemons without one-shot) rather than one per
+    # container. Stay under docker-py's default HTTP pool size of 10.
+    workers = min(_STATS_WORKERS, len(containers))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rows = [row for row in pool.map(_one, containers) if row is not None]
+    # Keep only containers seen this pass so removed ones do not linger.
+    _CPU_BASELINES = baselines
+    return rows
+
+
+def _read_log_head(container: Any, lines: int) -> bytes:
+    """Stream a container's log from the start and stop after *lines* lines.
+
+    Docker has no "head" option, so this avoids buffering the whole log just
+    to keep its first few lines.
+    """
+    # docker-py defaults follow to stream; without follow=False a running
+    # container with a short log would keep this iterator open forever.
+    stream = container.logs(stdout=True, stderr=True, stream=True, follow=False)
+    buf = bytearray()
+    newlines = 0
+    started = False
+    try:
+        for chunk in stream:
+            buf += chunk
+            if not started:
+                # Leading blank lines are stripped by the caller, so only
+                # count newlines from the first non-blank byte onwards.
+                chunk = chunk.lstrip()
+                if not chunk:
+                    continue
+                started = True
+            newlines += chunk.count(b"\n")
+            if newlines >= lines:
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    return bytes(buf)
 
 
 async def get_container_logs(container_name: str, lines: int = 50) -> str:
@@ -443,10 +747,14 @@ async def get_container_logs(container_name: str, lines: int = 50) -> str:
 
         try:
             if lines < 0:
-                raw = container.logs(stdout=True, stderr=True)
+                requested = abs(lines)
+                try:
+                    raw = _read_log_head(container, requested)
+                except Exception as e:
+                    logger.debug("streamed log head failed, reading all: %s", e)
+                    raw = container.logs(stdout=True, stderr=True)
                 combined = _decode(raw).strip()
                 log_lines = combined.splitlines()
-                requested = abs(lines)
                 return "\n".join(log_lines[:requested])
 
             raw = container.logs(stdout=True, stderr=True, tail=lines)
@@ -455,7 +763,7 @@ async def get_container_logs(container_name: str, lines: int = 50) -> str:
             logger.exception("Unexpected error getting container logs")
             return f"Unexpected error: {e}"
 
-    return await asyncio.to_thread(_fetch)
+    return await _to_thread(_fetch)
 
 
 async def get_container_logs_full(container_name: str, since: int | None = None) -> str:
@@ -484,7 +792,7 @@ async def get_container_logs_full(container_name: str, since: int | None = None)
             logger.exception("Unexpected error getting container logs")
             return f"Unexpected error: {e}"
 
-    return await asyncio.to_thread(_fetch)
+    return await _to_thread(_fetch)
 
 
 async def healthcheck_container(container_name: str) -> str:
@@ -495,7 +803,7 @@ async def healthcheck_container(container_name: str) -> str:
             return f"Error inspecting {container_name}"
 
         try:
-            container.reload()
+            # containers.get() already performed the inspect; attrs are fresh.
             state = container.attrs.get("State", {}) or {}
             health = state.get("Health")
             if health:
@@ -507,7 +815,7 @@ async def healthcheck_container(container_name: str) -> str:
         except Exception as e:
             return f"Error parsing state: {e}"
 
-    return await asyncio.to_thread(_inspect)
+    return await _to_thread(_inspect)
 
 
 async def get_container_inspect(container_name: str) -> dict:
@@ -523,28 +831,164 @@ async def get_container_inspect(container_name: str) -> dict:
                 f"Error reading inspect data for {container_name}: {exc}"
             ) from exc
 
-    return await asyncio.to_thread(_inspect)
+    return await _to_thread(_inspect)
+
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _icmp_ping_sync(host: str, count: int, timeout: float = 2.0) -> str | None:
+    """Ping *host* over an unprivileged ICMP datagram socket.
+
+    Returns ping-style output, or None when the kernel does not allow ICMP
+    datagram sockets for this process (``net.ipv4.ping_group_range``).
+    """
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except OSError:
+        return None
+
+    with sock:
+        try:
+            addr = socket.getaddrinfo(host, None, socket.AF_INET)[0][4][0]
+        except OSError as e:
+            return f"ping: {host}: {e}"
+        sock.settimeout(timeout)
+        lines = [f"PING {host} ({addr})"]
+        rtts: list[float] = []
+        payload = b"tele-home-supervisor"
+        for seq in range(1, count + 1):
+            header = struct.pack("!BBHHH", 8, 0, 0, 0, seq)
+            checksum = _icmp_checksum(header + payload)
+            packet = struct.pack("!BBHHH", 8, 0, checksum, 0, seq) + payload
+            start = time.perf_counter()
+            try:
+                sock.sendto(packet, (addr, 0))
+                while True:
+                    data, _ = sock.recvfrom(1024)
+                    # Datagram ICMP sockets deliver the reply without IP header.
+                    if len(data) >= 8 and data[0] == 0 and data[6:8] == packet[6:8]:
+                        break
+            except TimeoutError:
+                lines.append(f"Request timeout for icmp_seq={seq}")
+                continue
+            except OSError as e:
+                lines.append(f"icmp_seq={seq} {e}")
+                continue
+            rtt = (time.perf_counter() - start) * 1000.0
+            rtts.append(rtt)
+            lines.append(f"reply from {addr}: icmp_seq={seq} time={rtt:.2f} ms")
+
+    loss = 100.0 * (count - len(rtts)) / count if count else 0.0
+    lines.append(f"--- {host} ping statistics ---")
+    lines.append(
+        f"{count} packets transmitted, {len(rtts)} received, {loss:.0f}% packet loss"
+    )
+    if rtts:
+        avg = sum(rtts) / len(rtts)
+        lines.append(f"rtt min/avg/max = {min(rtts):.2f}/{avg:.2f}/{max(rtts):.2f} ms")
+    return "\n".join(lines)
 
 
 async def ping_host(host: str, count: int = 3) -> str:
-    ping_bin = shutil.which("ping") or "/bin/ping"
+    # Prefer an in-process ICMP probe: no fork/exec and no 1 s gap between
+    # echo requests. Fall back to the ping binary when the socket is denied.
+    out = await _to_thread(_icmp_ping_sync, host, count)
+    if out is not None:
+        return out
+    ping_bin = _which("ping") or "/bin/ping"
     rc, out, err = await cli.run_cmd(
         [ping_bin, "-c", str(count), "-W", "2", host], timeout=10
     )
     return out.strip() if out else (err or "No output")
 
 
+_TOP_ATTRS = ("pid", "username", "cpu_times", "create_time", "memory_percent", "name")
+_TOP_LIMIT = 10
+
+
 async def get_top_processes() -> str:
-    rc, out, err = await cli.run_cmd(["/bin/ps", "aux", "--sort=-%cpu"], timeout=5)
-    if rc != 0:
+    """Return the busiest processes as a ps-style table.
+
+    %CPU is the lifetime average (CPU time over wall time since start), the
+    same figure ``ps aux`` reports, so no sampling interval is needed.
+    """
+
+    def _collect() -> str:
+        now = time.time()
+        rows: list[tuple[float, int, str, float, str]] = []
+        # process_iter(attrs=...) reads each process inside oneshot().
+        for proc in psutil.process_iter(_TOP_ATTRS):
+            info = proc.info
+            times = info.get("cpu_times")
+            created = info.get("create_time")
+            elapsed = now - created if created else 0.0
+            cpu = (
+                (times.user + times.system) / elapsed * 100.0
+                if times and elapsed > 0
+                else 0.0
+            )
+            rows.append(
+                (
+                    cpu,
+                    info["pid"],
+                    info.get("username") or "?",
+                    info.get("memory_percent") or 0.0,
+                    info.get("name") or "?",
+                )
+            )
+
+        lines = [f"{'USER':<10} {'PID':>7} {'%CPU':>5} {'%MEM':>5} COMMAND"]
+        for cpu, pid, user, mem, name in heapq.nlargest(_TOP_LIMIT, rows):
+            lines.append(f"{user[:10]:<10} {pid:>7} {cpu:>5.1f} {mem:>5.1f} {name}")
+        return "\n".join(lines)
+
+    try:
+        return await _to_thread(_collect)
+    except Exception as e:
+        logger.debug("process listing failed: %s", e)
         return "Failed to get process list"
-    return "\n".join(out.splitlines()[:11])
 
 
 async def get_uptime_info() -> str:
     return human_uptime()
 
 
+_git_info: dict[str, str] | None = None
+
+
+async def _git_version_info() -> dict[str, str]:
+    """Return the last commit time and short hash from git, resolved once.
+
+    The checkout does not change while the bot runs, so both commands run
+    concurrently and a successful result is served from memory afterwards.
+    Failures (e.g. a timeout on a busy host) are retried on the next call.
+    """
+    global _git_info
+    if _git_info is not None:
+        return _git_info
+    (rc_time, out_time, _), (rc_hash, out_hash, _) = await asyncio.gather(
+        cli.run_cmd(
+            ["git", "log", "-1", "--format=%cd", "--date=format:%Y-%m-%d %H:%M:%S"],
+            timeout=3,
+        ),
+        cli.run_cmd(["git", "rev-parse", "--short", "HEAD"], timeout=3),
+    )
+    info = {
+        "last_commit": out_time.strip() if rc_time == 0 else "",
+        "commit_hash": out_hash.strip() if rc_hash == 0 else "",
+    }
+    if rc_time == 0 and rc_hash == 0:
+        _git_info = info
+    return info
+
+
 async def get_version_info() -> dict[str, str]:
     info = {}
     info["build"] = os.environ.get("TELE_HOME_SUPERVISOR_BUILD_VERSION", "")
@@ -560,22 +1004,10 @@ async def get_version_info() -> dict[str, str]:
     info["workflow"] = os.environ.get("GITHUB_WORKFLOW", "")
     info["repository"] = os.environ.get("GITHUB_REPOSITORY", "")
 
-    if not info["last_commit"]:
-        rc, out, _ = await cli.run_cmd(
-            ["git", "log", "-1", "--format=%cd", "--date=format:%Y-%m-%d %H:%M:%S"],
-            timeout=3,
-        )
-        if rc == 0:
-            info["last_commit"] = out.strip()
-
-    if not info["commit_hash"]:
-        rc, out, _ = await cli.run_cmd(
-            ["git", "rev-parse", "--short", "HEAD"], timeout=3
-        )
-        if rc == 0:
-            info["commit_hash"] = out.strip()
-
-    import sys
+    if not info["last_commit"] or not info["commit_hash"]:
+        git_info = await _git_version_info()
+        info["last_commit"] = info["last_commit"] or git_info["last_commit"]
+        info["commit_hash"] = info["commit_hash"] or git_info["commit_hash"]
 
     info["python"] = sys.version.split()[0]
 
@@ -592,7 +1024,7 @@ async def get_version_info() -> dict[str, str]:
 
 async def get_listening_ports() -> str:
     """List listening TCP/UDP ports."""
-    ss_bin = shutil.which("ss")
+    ss_bin = _which("ss")
     if not ss_bin:
         return "ss command not available"
 
@@ -622,33 +1054,31 @@ async def dns_lookup(name: str) -> str:
           2001:db8::1
     """
 
-    def _resolve():
-        try:
-            start = time.monotonic()
-            infos = socket.getaddrinfo(name, None)
-            elapsed_ms = (time.monotonic() - start) * 1000.0
-
-            ipv4 = set()
-            ipv6 = set()
-            for family, _, _, _, sockaddr in infos:
-                ip = sockaddr[0]
-                if family == socket.AF_INET:
-                    ipv4.add(ip)
-                elif family == socket.AF_INET6:
-                    ipv6.add(ip)
-
-            lines = [f"Lookup time: {elapsed_ms:.0f}ms"]
-            if ipv4:
-                lines.append("A:")
-                lines.extend(f"  {ip}" for ip in sorted(ipv4))
-            if ipv6:
-                lines.append("AAAA:")
-                lines.extend(f"  {ip}" for ip in sorted(ipv6))
-            return "\n".join(lines)
-        except Exception as e:
-            return f"Error: {e}"
-
-    return await asyncio.to_thread(_resolve)
+    loop = asyncio.get_running_loop()
+    try:
+        start = loop.time()
+        infos = await loop.getaddrinfo(name, None)
+        elapsed_ms = (loop.time() - start) * 1000.0
+    except Exception as e:
+        return f"Error: {e}"
+
+    ipv4 = set()
+    ipv6 = set()
+    for family, _, _, _, sockaddr in infos:
+        ip = sockaddr[0]
+        if family == socket.AF_INET:
+            ipv4.add(ip)
+        elif family == socket.AF_INET6:
+            ipv6.add(ip)
+
+    lines = [f"Lookup time: {elapsed_ms:.0f}ms"]
+    if ipv4:
+        lines.append("A:")
+        lines.extend(f"  {ip}" for ip in sorted(ipv4))
+    if ipv6:
+        lines.append("AAAA:")
+        lines.extend(f"  {ip}" for ip in sorted(ipv6))
+    return "\n".join(lines)
 
 
 async def get_disk_usage_stats(paths: list[str] | None = None) -> list[dict[str, Any]]:
@@ -681,13 +1111,13 @@ async def get_disk_usage_stats(paths: list[str] | None = None) -> list[dict[str,
                 logger.warning(f"Failed to check disk usage for {p}: {e}")
         return results
 
-    return await asyncio.to_thread(_collect)
+    return await _to_thread(_collect)
 
 
 async def traceroute_host(host: str, max_hops: int = 20) -> str:
     """Trace route to host."""
-    tracepath_bin = shutil.which("tracepath")
-    traceroute_bin = shutil.which("traceroute")
+    tracepath_bin = _which("tracepath")
+    traceroute_bin = _which("traceroute")
     cmd = None
     if tracepath_bin:
         cmd = [tracepath_bin, "-n", "-m", str(max_hops), host]
@@ -709,8 +1139,12 @@ def _fmt_rate_kbits(bits_per_s: float) -> str:
     return f"{kbps / 1000.0:.2f} Mb/s"
 
 
+_SPEEDTEST_TIMEOUT_S = 30.0
+_SPEEDTEST_CHUNK = 256 * 1024
+
+
 async def speedtest_download(mb: int = 100) -> str:
-    """Download speed test using curl and Cloudflare's speed test endpoint.
+    """Download speed test against Cloudflare's speed test endpoint.
 
     Args:
         mb: Size in megabytes to download (minimum 1, default 100)
@@ -721,63 +1155,45 @@ async def speedtest_download(mb: int = 100) -> str:
 
     Note:
         Uses a 30-second timeout and downloads from speed.cloudflare.com.
+        The body is streamed through the shared HTTP client and counted in
+        chunks, timed from the response headers to the last byte.
         Bandwidth is calculated in bits per second for accurate network measurements.
     """
-    curl_bin = shutil.which("curl")
-    if not curl_bin:
-        return "curl not available"
-
     bytes_to_download = max(1, int(mb)) * 1_000_000
     url = f"https://speed.cloudflare.com/__down?bytes={bytes_to_download}"
 
-    rc, out, err = await cli.run_cmd(
-        [
-            curl_bin,
-            "-fsSL",
-            "--max-time",
-            "30",
-            "-o",
-            "/dev/null",
-            "-w",
-            "TIME:%{time_total} SIZE:%{size_download}\n",
-            url,
-        ],
-        timeout=35,
-    )
-
-    if rc != 0:
-        return f"Speedtest failed: {err or out}"
-
+    downloaded = 0
     try:
-        out_clean = (out.strip() + "\n" + err.strip()).strip()
-        m = re.search(r"TIME:([0-9.]+)\s+SIZE:([0-9.]+)", out_clean)
-        if m:
-            seconds = float(m.group(1))
-            downloaded = float(m.group(2))
-        else:
-            m = re.search(
-                r"([0-9]+\.[0-9]+|[0-9]+)\s+([0-9]+\.[0-9]+|[0-9]+)",
-                out_clean,
-            )
-            if not m:
-                logger.warning("Speedtest output has insufficient parts: %s", out_clean)
-                return "Speedtest failed: invalid output format"
-            seconds = float(m.group(1))
-            downloaded = float(m.group(2))
-        if seconds <= 0:
-            return "Invalid duration"
-
-        # bits per second
-        bits_per_s = (downloaded * 8.0) / seconds
-
-        return (
-            f"Size: {downloaded / 1_000_000.0:.1f}MB\n"
-            f"Time: {seconds:.2f}s\n"
-            f"Rate: {_fmt_rate_kbits(bits_per_s)}"
-        )
-    except (ValueError, IndexError) as e:
-        logger.error(f"Speedtest parse error. Output: '{out[:200]}', Error: {e}")
-        return f"Parse error: {e}"
+        async with asyncio.timeout(_SPEEDTEST_TIMEOUT_S):
+            async with _get_http_client().stream(
+                "GET",
+                url,
+                # Uncompressed, so decoded chunk sizes equal bytes on the wire.
+                headers={"Accept-Encoding": "identity"},
+                timeout=_SPEEDTEST_TIMEOUT_S,
+                follow_redirects=True,
+            ) as resp:
+                resp.raise_for_status()
+                start = time.perf_counter()
+                async for chunk in resp.aiter_bytes(_SPEEDTEST_CHUNK):
+                    downloaded += len(chunk)
+                seconds = time.perf_counter() - start
+    except TimeoutError:
+        return f"Speedtest failed: timed out after {_SPEEDTEST_TIMEOUT_S:.0f}s"
+    except httpx.HTTPError as e:
+        return f"Speedtest failed: {e}"
+
+    if seconds <= 0 or not downloaded:
+        return "Invalid duration"
+
+    # bits per second
+    bits_per_s = (downloaded * 8.0) / seconds
+
+    return (
+        f"Size: {downloaded / 1_000_000.0:.1f}MB\n"
+        f"Time: {seconds:.2f}s\n"
+        f"Rate: {_fmt_rate_kbits(bits_per_s)}"
+    )
 
 
 def split_telegram_message(text: str, limit: int = 4000) -> list[str]:
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tele_home_supervisor import cli
+
+
+class _FakeProcess:
+    returncode = 0
+
+    def __init__(self, tracker: dict[str, int], release: asyncio.Event) -> None:
+        self._tracker = tracker
+        self._release = release
+
+    async def communicate(self) -> tuple[bytes, bytes]:
+        self._tracker["running"] += 1
+        self._tracker["peak"] = max(self._tracker["peak"], self._tracker["running"])
+        await self._release.wait()
+        self._tracker["running"] -= 1
+        return b"ok\n", b""
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_limiter_caps_concurrent_processes(monkeypatch):
+    tracker = {"running": 0, "peak": 0}
+    release = asyncio.Event()
+
+    async def _spawn(*_cmd, **_kwargs):
+        return _FakeProcess(tracker, release)
+
+    monkeypatch.setattr(cli.asyncio, "create_subprocess_exec", _spawn)
+    limiter = asyncio.Semaphore(2)
+
+    tasks = [
+        asyncio.create_task(cli.run_cmd(["true"], limiter=limiter)) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert tracker["running"] == 2
+
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert tracker["peak"] == 2
+    assert results == [(0, "ok", "")] * 5
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_without_limiter_does_not_queue(monkeypatch):
+    tracker = {"running": 0, "peak": 0}
+    release = asyncio.Event()
+
+    async def _spawn(*_cmd, **_kwargs):
+        return _FakeProcess(tracker, release)
+
+    monkeypatch.setattr(cli.asyncio, "create_subprocess_exec", _spawn)
+
+    tasks = [asyncio.create_task(cli.run_cmd(["true"])) for _ in range(12)]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert tracker["running"] == 12
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_slot_wait_counts_against_timeout(monkeypatch):
+    spawned: list[tuple[str, ...]] = []
+
+    async def _spawn(*cmd, **_kwargs):
+        spawned.append(cmd)
+        raise AssertionError("should not spawn")
+
+    monkeypatch.setattr(cli.asyncio, "create_subprocess_exec", _spawn)
+    limiter = asyncio.Semaphore(1)
+    await limiter.acquire()
+
+    result = await cli.run_cmd(["true"], timeout=0.05, limiter=limiter)
+
+    assert result == (124, "", "timeout")
+    assert spawned == []
+    limiter.release()
+    assert not limiter.locked()
+
+
+@pytest.mark.asyncio
+async def test_run_cmd_reports_missing_binary():
+    assert await cli.run_cmd(["definitely-not-a-real-binary-xyz"]) == (
+        127,
+        "",
+        "not found",
+    )
+
+
+def test_cached_which_walks_path_once(monkeypatch):
+    calls: list[str] = []
+
+    def _which(name):
+        calls.append(name)
+        return f"/usr/bin/{name}"
+
+    monkeypatch.setattr(cli.shutil, "which", _which)
+    cli.cached_which.cache_clear()
+    try:
+        assert cli.cached_which("ping") == "/usr/bin/ping"
+        assert cli.cached_which("ping") == "/usr/bin/ping"
+        assert calls == ["ping"]
+    finally:
+        cli.cached_which.cache_clear()
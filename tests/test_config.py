@@ -165,3 +165,10 @@ def test_settings_legacy_wol_populates_default_managed_host():
         assert settings.WOL_HELPER_IMAGE == "ghcr.io/example/wol-helper:latest"
         assert settings.WOL_SSH_PASSWORD == "hunter2"
         assert host.ssh_password_env == "WOL_SSH_PASSWORD"
+
+
+def test_settings_qbt_port_whitespace_and_invalid():
+    with mock.patch.dict(os.environ, {"QBT_PORT": " 9091 "}, clear=True):
+        assert config._read_settings().QBT_PORT == 9091
+    with mock.patch.dict(os.environ, {"QBT_PORT": "not-a-port"}, clear=True):
+        assert config._read_settings().QBT_PORT == 8080
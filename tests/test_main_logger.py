@@ -78,14 +78,17 @@ async def test_register_commands_and_startup_notification(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_post_shutdown_saves_state():
+async def test_post_shutdown_saves_state(monkeypatch):
     state = Mock()
     app = FakeApplication()
     app.bot_data[BOT_STATE_KEY] = state
+    close_http = AsyncMock()
+    monkeypatch.setattr(main.utils, "close_http_client", close_http)
 
     await main._post_shutdown(app)
 
     state.save.assert_called_once()
+    close_http.assert_awaited_once()
 
 
 def test_run_wires_callbacks(monkeypatch):
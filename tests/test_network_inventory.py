@@ -1,3 +1,4 @@
+import asyncio
 import time
 from pathlib import Path
 
@@ -116,7 +117,8 @@ async def test_scan_handles_empty_targets_and_ping_fallback(monkeypatch) -> None
 
     monkeypatch.setattr(network_inventory.shutil, "which", lambda name: None)
 
-    async def fake_run_cmd(cmd, timeout=10, env=None):
+    async def fake_run_cmd(cmd, timeout=10, env=None, limiter=None):
+        assert isinstance(limiter, asyncio.Semaphore)
         if cmd[-1] == "192.168.1.1":
             return 0, "pong", ""
         return 1, "", "timeout"
@@ -30,6 +30,7 @@ def test_qbt_403_ban_blocks_and_expires(monkeypatch):
     mock_client.auth_log_in.side_effect = auth_log_in_side_effect
 
     # 3. Only mock the Client, keep the real exception classes if possible
+    torrent._load_qbittorrentapi()
     with patch(
         "tele_home_supervisor.torrent.qbittorrentapi.Client", return_value=mock_client
     ):
@@ -50,3 +51,57 @@ def test_qbt_403_ban_blocks_and_expires(monkeypatch):
         assert mgr is not None
         assert mgr.qbt_client == mock_client
         assert mock_client.auth_log_in.call_count == 2
+
+
+def test_managers_share_one_logged_in_client(monkeypatch):
+    """Two managers with the same credentials log in only once."""
+    monkeypatch.setattr(torrent, "_ban_until", 0.0)
+    torrent.reset_manager()
+
+    mock_client = Mock()
+    torrent._load_qbittorrentapi()
+    with patch(
+        "tele_home_supervisor.torrent.qbittorrentapi.Client", return_value=mock_client
+    ) as client_cls:
+        first = torrent.TorrentManager(host="qb", port=8080, username="u", password="p")
+        second = torrent.TorrentManager(
+            host="qb", port=8080, username="u", password="p"
+        )
+        assert first.connect() is True
+        assert second.connect() is True
+
+        assert first.qbt_client is second.qbt_client is mock_client
+        assert client_cls.call_count == 1
+        assert mock_client.auth_log_in.call_count == 1
+
+        torrent.reset_manager()
+        assert first.connect() is True
+        assert mock_client.auth_log_in.call_count == 2
+
+    torrent.reset_manager()
+
+
+def test_get_manager_rechecks_idle_session(monkeypatch):
+    """A stale session found after idling is rebuilt with a fresh login."""
+    monkeypatch.setattr(torrent, "_ban_until", 0.0)
+    torrent.reset_manager()
+    mono = Mock(return_value=1000.0)
+    monkeypatch.setattr(torrent.time, "monotonic", mono)
+
+    stale, fresh = Mock(), Mock()
+    stale.app_version.side_effect = Exception("connection reset")
+    torrent._load_qbittorrentapi()
+    with patch(
+        "tele_home_supervisor.torrent.qbittorrentapi.Client",
+        side_effect=[stale, fresh],
+    ):
+        assert torrent.get_manager().qbt_client is stale
+        mono.return_value += 10
+        assert torrent.get_manager().qbt_client is stale
+        stale.app_version.assert_not_called()
+
+        mono.return_value += torrent._IDLE_RECHECK_S + 1
+        assert torrent.get_manager().qbt_client is fresh
+        assert fresh.auth_log_in.call_count == 1
+
+    torrent.reset_manager()
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import html
+import threading
 from types import SimpleNamespace
 from unittest.mock import Mock
 
+import pytest
+
 from tele_home_supervisor import torrent
 
 
@@ -13,9 +17,28 @@ class FakeClient:
         self.resumed = []
         self.deleted = []
         self.added = []
-
-    def torrents_info(self):
-        return self._torrents
+        self.sync_calls = []
+
+    def torrents_info(self, **kwargs):
+        torrents = self._torrents
+        if kwargs.get("hashes"):
+            wanted = set(kwargs["hashes"].split("|"))
+            torrents = [t for t in torrents if getattr(t, "hash", "") in wanted]
+        if kwargs.get("reverse"):
+            torrents = list(reversed(torrents))
+        limit = kwargs.get("limit")
+        return torrents[:limit] if limit is not None else torrents
+
+    def sync_maindata(self, rid=0):
+        self.sync_calls.append(rid)
+        return {
+            "rid": rid + 1,
+            "full_update": True,
+            "torrents": {
+                torrent._torrent_hash(t): t if isinstance(t, dict) else vars(t)
+                for t in self._torrents
+            },
+        }
 
     def torrents_add(self, **kwargs):
         self.added.append(kwargs)
@@ -153,6 +176,24 @@ def test_hash_based_torrent_actions():
     assert manager.info_by_hash("missing") == "Torrent not found."
 
 
+def test_full_hash_lookup_queries_only_that_hash():
+    full_hash = "a" * 40
+    client = FakeClient([torrent_obj(hash=full_hash), torrent_obj(hash="b" * 40)])
+    manager = manager_with(client)
+    seen = []
+    original_info = client.torrents_info
+
+    def tracking_info(**kwargs):
+        seen.append(kwargs)
+        return original_info(**kwargs)
+
+    client.torrents_info = tracking_info
+
+    assert manager.stop_by_hash(full_hash).startswith("⏸️ Paused:")
+    assert manager.info_by_hash("bbbb").startswith("<b>Ubuntu ISO</b>")
+    assert seen == [{"hashes": full_hash}, {}]
+
+
 def test_missing_files_preview_and_clean():
     client = FakeClient(
         [
@@ -183,6 +224,22 @@ def test_call_delete_handles_empty_and_failed_verification():
     assert manager._call_delete(["abcdef123456"], delete_files=True) is False
 
 
+def test_call_delete_verifies_only_requested_hashes():
+    client = FakeClient([torrent_obj(), torrent_obj(name="Other", hash="222")])
+    manager = manager_with(client)
+    seen = []
+    original_info = client.torrents_info
+
+    def tracking_info(**kwargs):
+        seen.append(kwargs)
+        return original_info(**kwargs)
+
+    client.torrents_info = tracking_info
+
+    assert manager._call_delete(["222"], delete_files=False) is True
+    assert seen == [{"hashes": "222"}]
+
+
 def test_pause_resume_handles_empty_and_unknown_client_failures():
     client = FakeClient([torrent_obj()])
     manager = manager_with(client)
@@ -194,3 +251,284 @@ def test_pause_resume_handles_empty_and_unknown_client_failures():
 
     client.torrents_pause = fail
     assert manager._call_pause_resume(["abcdef123456"], "pause") is False
+
+
+def test_status_escapes_names_and_honours_limit():
+    client = FakeClient(
+        [
+            torrent_obj(name="A & B <x>"),
+            torrent_obj(name="Second", hash="222", dlspeed=4096),
+            torrent_obj(name="Idle", hash="333", dlspeed=0, upspeed=0),
+        ]
+    )
+    manager = manager_with(client)
+
+    status = manager.get_status(limit=1, active_only=True)
+    assert "Idle" not in manager.get_status(limit=5, active_only=True)
+    assert "<b>Idle</b>" in manager.get_status()
+
+    assert "<b>Second</b>" in status
+    assert "A &amp; B" not in status
+    assert "<b>A &amp; B &lt;x&gt;</b>" in manager.get_status(limit=None)
+    assert torrent._fast_escape("plain name") == "plain name"
+    for name in ("A & B <x>", "Фильм 'q' & \"r\"", "bad \ud800 <s>"):
+        assert torrent._fast_escape(name) == html.escape(name)
+
+
+def test_default_status_requests_only_newest_torrents():
+    client = Mock()
+    client.torrents_info.return_value = [torrent_obj()]
+    manager = manager_with(client)
+
+    assert "<b>Ubuntu ISO</b>" in manager.get_status()
+    client.torrents_info.assert_called_once_with(
+        sort="added_on", reverse=True, limit=torrent._STATUS_LIMIT
+    )
+
+
+def test_status_counts_the_rest_of_the_library_without_rendering_it(monkeypatch):
+    client = FakeClient([torrent_obj(name=f"T{i}", hash=f"h{i}") for i in range(25)])
+    manager = manager_with(client)
+    formatted: list[str] = []
+    real_format = torrent._format_status
+
+    def counting_format(t, debug=False):
+        formatted.append(t.name)
+        return real_format(t, debug)
+
+    monkeypatch.setattr(torrent, "_format_status", counting_format)
+
+    status = manager.get_status()
+
+    assert status.endswith("\n\n... and 5 more torrent(s)")
+    assert status.count("<b>T") == torrent._STATUS_LIMIT
+    assert len(formatted) == torrent._STATUS_LIMIT
+    assert client.sync_calls == [0]
+
+
+def test_get_status_does_not_cache_errors():
+    client = Mock()
+    client.torrents_info.side_effect = [RuntimeError("boom"), [torrent_obj()]]
+    manager = manager_with(client)
+
+    assert manager.get_status().startswith("Error retrieving status:")
+    assert manager._status_cache is None
+    assert "<b>Ubuntu ISO</b>" in manager.get_status()
+
+
+def test_slow_status_fetch_does_not_block_other_views():
+    release = threading.Event()
+    entered = threading.Event()
+    client = FakeClient([torrent_obj()])
+    real_info = client.torrents_info
+
+    def slow_info(**kwargs):
+        entered.set()
+        release.wait(2)
+        return real_info(**kwargs)
+
+    client.torrents_info = slow_info
+    manager = manager_with(client)
+    slow = threading.Thread(target=manager.get_status)
+    slow.start()
+    try:
+        assert entered.wait(2)
+        assert "<b>Ubuntu ISO</b>" in manager.get_status(active_only=True)
+    finally:
+        release.set()
+        slow.join()
+
+
+def test_magnet_dn_parsing():
+    assert torrent._magnet_dn("magnet:?dn=First&xt=urn:btih:abc") == "First"
+    assert (
+        torrent._magnet_dn("magnet:?xt=urn:btih:abc&dn=A%26B+C&tr=udp://x") == "A&B C"
+    )
+    assert torrent._magnet_dn("magnet:?xt=urn:btih:abc&xdn=nope") == "Unknown Torrent"
+    assert torrent._magnet_dn("magnet:?xt=urn:btih:abc&dn=") == "Unknown Torrent"
+    assert torrent._magnet_dn("http://example.com/a.torrent") == "Unknown Torrent"
+
+
+def test_iter_torrent_lines_yields_one_block_per_torrent():
+    client = FakeClient([torrent_obj(), torrent_obj(name="Second", hash="222")])
+    manager = manager_with(client)
+
+    lines = list(manager.iter_torrent_lines())
+
+    assert len(lines) == 2
+    assert lines[0].startswith("<b>Ubuntu ISO</b>")
+    assert manager.get_status(limit=None) == "\n\n".join(lines)
+    empty = FakeClient()
+    assert manager_with(empty).get_status() == "No active torrents found."
+    assert empty.sync_calls == []
+    assert manager_with(empty).get_status(active_only=True) == (
+        "No active torrents found."
+    )
+    assert empty.sync_calls == [0]
+
+
+def test_basic_fields_falls_back_for_partial_objects():
+    full = torrent_obj()
+    partial = SimpleNamespace(name="Only name")
+
+    assert torrent._basic_fields(full) == ("Ubuntu ISO", "downloading", 0.5, 2048, 1024)
+    assert torrent._basic_fields(partial) == ("Only name", None, None, None, None)
+    assert "Status: unknown" in torrent._format_status(partial)
+
+
+def test_torrent_sizes_fallbacks_and_clamping():
+    assert torrent._torrent_sizes(torrent_obj(), 0.5) == (1_000_000, 2_000_000)
+    assert torrent._torrent_sizes(torrent_obj(completed=None), 0.25) == (
+        500_000,
+        2_000_000,
+    )
+    assert torrent._torrent_sizes(torrent_obj(completed="5000000"), 0.5) == (
+        2_000_000,
+        2_000_000,
+    )
+    assert torrent._torrent_sizes(torrent_obj(total_size=0), 0.5) == (0, 0)
+
+
+def test_get_status_truncates_to_one_message_with_notice():
+    client = FakeClient(
+        [torrent_obj(name=f"T{i} " + "x" * 500, hash=str(i)) for i in range(20)]
+    )
+    manager = manager_with(client)
+
+    status = manager.get_status(limit=None)
+    report, _, notice = status.rpartition("\n\n")
+
+    assert len(report) <= torrent._STATUS_CHUNK_CHARS
+    shown = report.count("<b>T")
+    assert 0 < shown < 20
+    assert notice == f"... and {20 - shown} more torrent(s)"
+
+
+def test_dict_entries_are_read_without_attribute_access():
+    entry = {
+        "name": "Dict ISO",
+        "hash": "dd11",
+        "state": "downloading",
+        "progress": 0.5,
+        "dlspeed": 1024,
+        "upspeed": 0,
+        "total_size": 2_000_000,
+        "completed": 1_000_000,
+    }
+    manager = manager_with(FakeClient([entry]))
+
+    assert torrent._basic_fields({"name": "x"}) == ("x", None, None, None, None)
+    assert manager.get_torrent_list()[0]["size_summary"] == "1.0MB/2.0MB"
+    assert manager.stop_by_name("dict").startswith("Paused:")
+    assert "<b>Dict ISO</b>" in manager.get_status()
+
+
+def test_sync_torrents_applies_incremental_diffs():
+    responses = iter(
+        [
+            {
+                "rid": 1,
+                "full_update": True,
+                "torrents": {
+                    "aa": {"name": "Alpha", "dlspeed": 2048, "state": "downloading"},
+                    "bb": {"name": "Beta", "dlspeed": 1024, "state": "downloading"},
+                },
+            },
+            {"rid": 2, "torrents": {"aa": {"dlspeed": 0}}, "torrents_removed": ["bb"]},
+            {
+                "rid": 3,
+                "full_update": True,
+                "torrents": {"cc": {"name": "Gamma", "dlspeed": 512}},
+            },
+        ]
+    )
+    client = Mock()
+    client.sync_maindata.side_effect = lambda rid: next(responses)
+    manager = manager_with(client)
+
+    assert {t["hash"] for t in manager._sync_torrents()} == {"aa", "bb"}
+    assert manager._sync_torrents() == [
+        {"name": "Alpha", "dlspeed": 0, "state": "downloading", "hash": "aa"}
+    ]
+    assert manager.get_status(active_only=True).startswith("<b>Gamma</b>")
+    assert [c.kwargs["rid"] for c in client.sync_maindata.call_args_list] == [0, 1, 2]
+    assert manager._rid == 3
+    assert [t["name"] for t in manager._state.values()] == ["Gamma"]
+
+
+def test_sync_cursor_restarts_after_reconnect(monkeypatch):
+    old = FakeClient([torrent_obj(name="Old", hash="aa")])
+    manager = manager_with(old)
+    manager._sync_torrents()
+    manager._sync_torrents()
+    assert old.sync_calls == [0, 1]
+
+    # qBittorrent restarted: the shared client is rebuilt on reconnect.
+    new = FakeClient([torrent_obj(name="New", hash="bb")])
+    torrent._drop_shared_client()
+    monkeypatch.setattr(torrent, "_load_qbittorrentapi", lambda: object())
+    monkeypatch.setattr(torrent, "_get_shared_client", lambda *args: new)
+    assert manager.connect()
+
+    assert [t["name"] for t in manager._sync_torrents()] == ["New"]
+    assert new.sync_calls == [0]
+
+
+def test_sync_cursor_restarts_after_failed_poll():
+    client = Mock()
+    client.sync_maindata.side_effect = [
+        {"rid": 4, "full_update": True, "torrents": {"aa": {"name": "A"}}},
+        ConnectionError("reset"),
+        {"rid": 1, "full_update": True, "torrents": {}},
+    ]
+    manager = manager_with(client)
+
+    manager._sync_torrents()
+    with pytest.raises(ConnectionError):
+        manager._sync_torrents()
+    assert manager._sync_torrents() == []
+    assert [c.kwargs["rid"] for c in client.sync_maindata.call_args_list] == [0, 4, 0]
+
+
+def test_get_status_reuses_report_within_ttl():
+    client = FakeClient([torrent_obj()])
+    manager = manager_with(client)
+
+    first = manager.get_status(active_only=True)
+    client._torrents = [torrent_obj(name="Changed")]
+    assert manager.get_status(active_only=True) == first
+    assert client.sync_calls == [0]
+
+    ts, key, text = manager._status_cache
+    manager._status_cache = (ts - torrent._STATUS_CACHE_TTL_S, key, text)
+    assert "<b>Changed</b>" in manager.get_status(active_only=True)
+    # The full listing is cached under its own key.
+    assert "<b>Changed</b>" in manager.get_status()
+
+
+def test_connection_errors_are_logged_without_traceback(caplog):
+    qbt = torrent._load_qbittorrentapi()
+    client = Mock()
+    client.sync_maindata.side_effect = qbt.APIConnectionError("refused")
+    client.torrents_add.side_effect = ValueError("bad magnet")
+    manager = manager_with(client)
+
+    assert manager.get_status(active_only=True).startswith("Error retrieving status:")
+    assert manager.add_magnet("magnet:?dn=x").startswith("Failed to add torrent:")
+
+    unreachable, failed = caplog.records[-2:]
+    assert unreachable.levelname == "WARNING" and unreachable.exc_info is None
+    assert failed.levelname == "ERROR" and failed.exc_info is not None
+
+
+def test_http_errors_still_log_tracebacks(caplog):
+    qbt = torrent._load_qbittorrentapi()
+    client = Mock()
+    client.torrents_add.side_effect = qbt.HTTP409Error("torrent rejected")
+    manager = manager_with(client)
+
+    assert manager.add_magnet("magnet:?dn=x").startswith("Failed to add torrent:")
+
+    record = caplog.records[-1]
+    assert record.levelname == "ERROR" and record.exc_info is not None
+    assert "unreachable" not in record.getMessage()
@@ -1,9 +1,12 @@
 """Tests for the torrent sources fallback module."""
 
+import asyncio
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tele_home_supervisor import torrentsources
 from tele_home_supervisor.torrentsources import (
     CLOUDSCRAPER_AVAILABLE,
     BitSearchSource,
@@ -64,6 +67,25 @@ BITSEARCH_SAMPLE_HTML = """
 </html>
 """
 
+# Sample LimeTorrents table: header row, one result, one row without a hash
+LIMETORRENTS_SAMPLE_HTML = """
+<table class="table2">
+<tr class="header"><th>Torrent Name</th><th>Seed</th><th>Leech</th></tr>
+<tr class="bg">
+    <td class="tdleft"><div class="tt-name">
+        <a href="http://itorrents.org/torrent/0123456789abcdef0123456789abcdef01234567.torrent"
+            class="csprite_dl14"></a>
+        <a href="/Ubuntu-torrent-1.html" class="coll-1 name">Ubuntu 24.04 &amp; Desktop</a>
+    </div></td>
+    <td class="tdseed">165</td><td class="tdleech">10</td>
+</tr>
+<tr class="bg">
+    <td class="tdleft"><a href="/No-hash-torrent-2.html" class="coll-1">No hash</a></td>
+    <td class="tdseed">5</td><td class="tdleech">1</td>
+</tr>
+</table>
+"""
+
 # Sample EZTV API response
 EZTV_SAMPLE_RESPONSE = {
     "torrents_count": 2,
@@ -112,12 +134,76 @@ class TestHelperFunctions:
         headers = _build_browser_headers(referer="https://example.com")
         assert headers["Referer"] == "https://example.com"
 
+    def test_extract_btih(self):
+        assert torrentsources._extract_btih("magnet:?xt=urn:btih:ab12&dn=x") == "AB12"
+        assert torrentsources._extract_btih("magnet:?xt=urn:btih:cd34") == "CD34"
+        assert torrentsources._extract_btih("magnet:?xt=urn:btih:&dn=x") is None
+        assert torrentsources._extract_btih("magnet:?dn=x") is None
+
+    def test_fast_unescape(self):
+        plain = "magnet:?xt=urn:btih:AB&dn=x&tr=udp"
+        assert torrentsources._fast_unescape(plain) is plain
+        assert torrentsources._fast_unescape("a&amp;b&#39;c") == "a&b'c"
+
+    def test_cf_blocked_checks_page_head(self):
+        assert torrentsources._cf_blocked("<title>Just a Moment...</title>")
+        assert torrentsources._cf_blocked('<script src="/cdn-cgi/cf-chl/x"></script>')
+        assert not torrentsources._cf_blocked("<html>results</html>")
+        assert not torrentsources._cf_blocked("x" * 5000 + "just a moment")
+
     def test_build_magnet(self):
         magnet = _build_magnet("ABC123", "Test Torrent")
         assert magnet.startswith("magnet:?xt=urn:btih:ABC123")
         assert "dn=Test%20Torrent" in magnet
         assert "tr=" in magnet
 
+    def test_cloudscraper_session_is_reused_per_thread(self, monkeypatch):
+        fake_module = MagicMock()
+        fake_module.create_scraper.side_effect = lambda **_kwargs: object()
+        monkeypatch.setattr(torrentsources, "cloudscraper", fake_module)
+        monkeypatch.setattr(torrentsources, "_CLOUDSCRAPER_LOCAL", threading.local())
+        monkeypatch.setattr(torrentsources, "_CLOUDSCRAPER_FAILED", False)
+
+        first = torrentsources._get_cloudscraper_session()
+        assert torrentsources._get_cloudscraper_session() is first
+
+        other: list[object] = []
+        worker = threading.Thread(
+            target=lambda: other.append(torrentsources._get_cloudscraper_session())
+        )
+        worker.start()
+        worker.join()
+
+        assert other[0] is not first
+        assert fake_module.create_scraper.call_count == 2
+
+    def test_cloudscraper_session_failure_is_not_retried(self, monkeypatch):
+        fake_module = MagicMock()
+        fake_module.create_scraper.side_effect = RuntimeError("no browser data")
+        monkeypatch.setattr(torrentsources, "cloudscraper", fake_module)
+        monkeypatch.setattr(torrentsources, "_CLOUDSCRAPER_LOCAL", threading.local())
+        monkeypatch.setattr(torrentsources, "_CLOUDSCRAPER_FAILED", False)
+
+        assert torrentsources._get_cloudscraper_session() is None
+        assert torrentsources._get_cloudscraper_session() is None
+        fake_module.create_scraper.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_fetch_with_cloudscraper_rejects_challenge_pages(self, monkeypatch):
+        page = MagicMock(content=b"<html>results</html>", text="<html>results</html>")
+        challenge = MagicMock(content=b"<title>Just a moment...</title>")
+        session = MagicMock()
+        session.get.side_effect = [page, challenge]
+        monkeypatch.setattr(torrentsources, "CLOUDSCRAPER_AVAILABLE", True)
+        monkeypatch.setattr(torrentsources, "_CLOUDSCRAPER_FAILED", False)
+        monkeypatch.setattr(
+            torrentsources, "_get_cloudscraper_session", lambda: session
+        )
+
+        fetch = torrentsources._fetch_with_cloudscraper
+        assert await fetch("https://example.com/a") == "<html>results</html>"
+        assert await fetch("https://example.com/b") is None
+
 
 class TestTorrentResult:
     """Test TorrentResult class."""
@@ -148,12 +234,30 @@ class TestBitSearchSource:
         magnet = "magnet:?xt=urn:btih:ABC&dn=%5BBitsearch.to%5D%20ubuntu-24.04.iso"
         name = source._extract_name_from_magnet(magnet)
         assert name == "ubuntu-24.04.iso"
+        for prefix in ("%5BBitSearch.to%5D", "%5BBITSEARCH.TO%5D"):
+            magnet = f"magnet:?xt=urn:btih:ABC&dn={prefix}+ubuntu.iso"
+            assert source._extract_name_from_magnet(magnet) == "ubuntu.iso"
 
     def test_extract_name_from_magnet_no_prefix(self):
         source = BitSearchSource()
         magnet = "magnet:?xt=urn:btih:ABC&dn=test-file.iso"
         name = source._extract_name_from_magnet(magnet)
         assert name == "test-file.iso"
+        assert source._extract_name_from_magnet("magnet:?xdn=x") == "Unknown"
+        assert source._extract_name_from_magnet("magnet:?dn=A+B%26C") == "A B&C"
+
+    def test_parse_results_pairs_counts_with_following_magnet(self):
+        results = BitSearchSource()._parse_results(BITSEARCH_SAMPLE_HTML)
+        assert [(r.seeders, r.leechers) for r in results] == [(165, 10), (100, 5)]
+        assert results[1].name == "ubuntu-22.04-server.iso"
+
+    def test_parse_results_survives_nested_list_items(self):
+        nested = BITSEARCH_SAMPLE_HTML.replace(
+            '<li class="card search-result">',
+            '<li class="card search-result"><ul><li>Tag</li></ul>',
+        )
+        results = BitSearchSource()._parse_results(nested)
+        assert [(r.seeders, r.leechers) for r in results] == [(165, 10), (100, 5)]
 
     @pytest.mark.asyncio
     @patch.object(BitSearchSource, "_fetch")
@@ -166,6 +270,15 @@ class TestBitSearchSource:
         assert results[0].seeders >= results[1].seeders  # Sorted by seeders
         assert results[0].source == "BitSearch"
 
+    @pytest.mark.asyncio
+    @patch.object(BitSearchSource, "search")
+    async def test_top_maps_category_case_insensitively(self, mock_search):
+        mock_search.return_value = []
+        source = BitSearchSource()
+        await source.top("Movies")
+        await source.top("unknown")
+        assert [c.args[0] for c in mock_search.call_args_list] == ["1080p", "2024"]
+
     @pytest.mark.asyncio
     @patch.object(BitSearchSource, "_fetch")
     async def test_search_empty_query(self, mock_fetch):
@@ -239,6 +352,30 @@ class TestX1337Source:
         source = X1337Source()
         assert source.enabled == CLOUDSCRAPER_AVAILABLE
 
+    @pytest.mark.asyncio
+    async def test_resolve_magnets_fetches_detail_pages_concurrently(self):
+        source = X1337Source()
+        in_flight = 0
+        peak = 0
+
+        async def fake_detail(url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return None if url.endswith("2") else f"magnet:?xt=urn:btih:{url[-1]}"
+
+        items = [
+            {"name": f"T{i}", "detail_url": f"/d{i}", "seeders": i, "leechers": 0}
+            for i in range(4)
+        ]
+        with patch.object(source, "_get_magnet_from_detail_page", fake_detail):
+            results = await source._resolve_magnets(items)
+
+        assert peak == 4
+        assert [r.name for r in results] == ["T0", "T1", "T3"]
+
     @pytest.mark.asyncio
     async def test_search_when_disabled(self):
         source = X1337Source()
@@ -275,6 +412,25 @@ class TestLimeTorrentsSource:
         results = await source.top()
         assert results == []
 
+    def test_parse_results_decodes_named_entities_in_titles(self):
+        page = LIMETORRENTS_SAMPLE_HTML.replace(
+            "Ubuntu 24.04 &amp; Desktop",
+            "&quot;Ubuntu&quot; &lt;24.04&gt; &apos;LTS&apos;",
+        )
+        results = LimeTorrentsSource()._parse_results(page)
+
+        assert results[0].name == "\"Ubuntu\" <24.04> 'LTS'"
+
+    def test_parse_results_skips_rows_without_name_or_hash(self):
+        results = LimeTorrentsSource()._parse_results(LIMETORRENTS_SAMPLE_HTML)
+
+        assert len(results) == 1
+        assert results[0].name == "Ubuntu 24.04 & Desktop"
+        assert (results[0].seeders, results[0].leechers) == (165, 10)
+        assert results[0].magnet.startswith(
+            "magnet:?xt=urn:btih:0123456789ABCDEF0123456789ABCDEF01234567&dn="
+        )
+
 
 class TestFallbackFunctions:
     """Tests for fallback search and top functions."""
@@ -293,6 +449,18 @@ class TestFallbackFunctions:
             assert "1337x" not in source_names
             assert "LimeTorrents" not in source_names
 
+    def test_enabled_sources_follow_provider_changes(self):
+        assert get_enabled_sources() is get_enabled_sources()
+        try:
+            torrentsources.toggle_provider("bitsearch")
+            assert "BitSearch" not in [s.name for s in get_enabled_sources()]
+            torrentsources.set_forced_provider("EZTV")
+            assert [s.name for s in get_enabled_sources()] == ["EZTV"]
+        finally:
+            torrentsources.toggle_provider("bitsearch")
+            torrentsources.set_forced_provider(None)
+        assert "BitSearch" in [s.name for s in get_enabled_sources()]
+
     @pytest.mark.asyncio
     @patch.object(BitSearchSource, "search")
     async def test_fallback_search_first_source_succeeds(self, mock_search):
@@ -349,6 +517,10 @@ class TestFallbackFunctions:
 
         results = await fallback_search("nonexistent query")
         assert results == []
+        # The empty answer is cached briefly, so a retry does not re-query
+        assert await fallback_search("Nonexistent Query ") == []
+        mock_bitsearch_search.assert_called_once()
+        torrentsources._search_cache.clear()
 
     @pytest.mark.asyncio
     @patch.object(BitSearchSource, "top")
@@ -385,3 +557,41 @@ class TestFallbackFunctions:
         results = await fallback_top("movies")
         assert len(results) == 1
         mock_top.assert_called_with("movies", None)
+
+    @pytest.mark.asyncio
+    @patch("tele_home_supervisor.torrentsources.get_enabled_sources")
+    async def test_fallback_search_does_not_wait_for_slow_source(
+        self, mock_get_enabled
+    ):
+        slow_started = asyncio.Event()
+        slow_cancelled = False
+
+        async def slow_search(query, debug_sink=None):
+            nonlocal slow_cancelled
+            slow_started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                slow_cancelled = True
+                raise
+            return []
+
+        async def fast_search(query, debug_sink=None):
+            await slow_started.wait()
+            return [
+                TorrentResult(
+                    name="Fast", magnet="magnet:?", seeders=1, leechers=0, source="EZTV"
+                )
+            ]
+
+        bitsearch, eztv = BitSearchSource(), EZTVSource()
+        bitsearch.search = slow_search
+        eztv.search = fast_search
+        mock_get_enabled.return_value = [bitsearch, eztv]
+
+        results = await fallback_search("slow vs fast")
+        await asyncio.sleep(0)
+
+        assert [r.name for r in results] == ["Fast"]
+        assert torrentsources.get_last_used_provider() == "EZTV"
+        assert slow_cancelled
@@ -1,5 +1,7 @@
-from unittest.mock import AsyncMock, Mock, patch
+import threading
+from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 
 from tele_home_supervisor import utils
@@ -7,26 +9,48 @@ from tele_home_supervisor import utils
 
 @pytest.mark.asyncio
 async def test_get_primary_ip_success():
-    with patch("tele_home_supervisor.cli.run_cmd", new_callable=AsyncMock) as mock_run:
-        # Mock successful ip route command
-        mock_run.return_value = (0, "192.168.1.50", "")
+    with patch("tele_home_supervisor.utils.socket.socket") as mock_socket:
+        # Mock the kernel-selected source address for the UDP route probe
+        sock = mock_socket.return_value.__enter__.return_value
+        sock.getsockname.return_value = ("192.168.1.50", 40000)
 
         ip = await utils.get_primary_ip()
         assert ip == "192.168.1.50"
+        sock.connect.assert_called_once_with(("1.1.1.1", 80))
 
 
-@pytest.mark.asyncio
-async def test_get_wan_ip_failure():
-    with patch("tele_home_supervisor.cli.run_cmd", new_callable=AsyncMock) as mock_run:
-        # Mock curl failure
-        mock_run.return_value = (1, "", "timeout")
+def _mock_wan_services(monkeypatch, handler):
+    requests: list[httpx.Request] = []
+
+    def _record(request):
+        requests.append(request)
+        return handler(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_record))
+    monkeypatch.setattr(utils, "_get_http_client", lambda: client)
+    return requests
 
-        ip = await utils.get_wan_ip()
-        assert ip == "n/a"
+
+@pytest.mark.asyncio
+async def test_get_wan_ip_failure(monkeypatch):
+    monkeypatch.setattr(utils, "_wan_ip_cache", None)
+    # Every service answers with an error or a non-IP body (captive portal)
+    _mock_wan_services(
+        monkeypatch,
+        lambda request: (
+            httpx.Response(503)
+            if "amazonaws" in request.url.host
+            else httpx.Response(200, text="<html>login</html>")
+        ),
+    )
+
+    ip = await utils.get_wan_ip()
+    assert ip == "n/a"
 
 
 @pytest.mark.asyncio
-async def test_container_stats_rich_parsing():
+async def test_container_stats_rich_parsing(monkeypatch):
+    monkeypatch.setattr(utils, "_STATS_CACHE", [])
     stats_payload = {
         "cpu_stats": {
             "cpu_usage": {"total_usage": 1250, "percpu_usage": [1, 1]},
@@ -48,12 +72,9 @@ async def test_container_stats_rich_parsing():
         "pids_stats": {"current": 123},
     }
 
-    fake_container = Mock()
-    fake_container.name = "my-container"
-    fake_container.stats.return_value = stats_payload
-
     fake_client = Mock()
-    fake_client.containers.list.return_value = [fake_container]
+    fake_client.api.containers.return_value = [{"Id": "c1", "Names": ["/my-container"]}]
+    fake_client.api.stats.return_value = stats_payload
 
     with patch("tele_home_supervisor.utils.client", fake_client):
         stats = await utils.container_stats_rich()
@@ -64,24 +85,152 @@ async def test_container_stats_rich_parsing():
 
 
 @pytest.mark.asyncio
-async def test_speedtest_parser_success():
-    with (
-        patch("shutil.which", return_value="/usr/bin/curl"),
-        patch("tele_home_supervisor.cli.run_cmd", new_callable=AsyncMock) as mock_run,
-    ):
-        # curl -w "TIME:%{time_total} SIZE:%{size_download}" output
-        # 2.0 seconds, 10,000,000 bytes (10MB)
-        mock_run.return_value = (0, "TIME:2.0 SIZE:10000000", "")
-
-        result = await utils.speedtest_download(10)
-        assert "Size: 10.0MB" in result
-        assert "Time: 2.00s" in result
-        # 10MB / 2s = 5MB/s. 5MB/s * 8 = 40Mbps = 40.00 Mb/s
-        assert "40.00 Mb/s" in result
+async def test_container_stats_rich_serves_cached_snapshot(monkeypatch):
+    monkeypatch.setattr(utils, "_STATS_CACHE", [])
+    clock = [500.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+
+    fake_client = Mock()
+    fake_client.api.containers.return_value = [{"Id": "c1", "Names": ["/app"]}]
+    fake_client.api.stats.return_value = {}
+
+    with patch("tele_home_supervisor.utils.client", fake_client):
+        first = await utils.container_stats_rich()
+        second = await utils.container_stats_rich()
+        assert first == second
+        assert fake_client.api.stats.call_count == 1
+
+        clock[0] += utils._STATS_TTL_S + 1
+        await utils.container_stats_rich()
+        assert fake_client.api.stats.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_container_stats_rich_one_shot_cpu_uses_previous_pass(monkeypatch):
+    monkeypatch.setattr(utils, "_STATS_CACHE", [])
+    monkeypatch.setattr(utils, "_CPU_BASELINES", {})
+    clock = [100.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    samples = iter([(1000, 90000), (1250, 100000)])
+
+    def _stats(container_id, stream, one_shot=None):
+        assert (stream, one_shot) == (False, True)
+        total, system = next(samples)
+        return {
+            "cpu_stats": {
+                "cpu_usage": {"total_usage": total},
+                "system_cpu_usage": system,
+                "online_cpus": 2,
+            },
+            "precpu_stats": {"cpu_usage": {}},
+        }
+
+    fake_client = Mock()
+    fake_client.api.containers.return_value = [{"Id": "c1", "Names": ["/app"]}]
+    fake_client.api.stats.side_effect = _stats
+
+    with patch("tele_home_supervisor.utils.client", fake_client):
+        first = await utils.container_stats_rich()
+        clock[0] += utils._STATS_TTL_S + 1
+        second = await utils.container_stats_rich()
+
+    assert first[0]["cpu"] == "0.00%"
+    assert second[0]["cpu"] == "5.00%"
+    assert utils._CPU_BASELINES == {"c1": (1250, 100000)}
+
+
+@pytest.mark.asyncio
+async def test_speedtest_counts_streamed_bytes(monkeypatch):
+    requests = _mock_wan_services(
+        monkeypatch, lambda request: httpx.Response(200, content=b"0" * 10_000_000)
+    )
+
+    result = await utils.speedtest_download(10)
+
+    assert requests[0].url.params["bytes"] == "10000000"
+    assert "Size: 10.0MB" in result
+    assert "Time: " in result
+    assert "Rate: " in result
+
+
+@pytest.mark.asyncio
+async def test_speedtest_http_error(monkeypatch):
+    _mock_wan_services(monkeypatch, lambda request: httpx.Response(503))
+
+    result = await utils.speedtest_download()
+    assert result.startswith("Speedtest failed")
+
+
+@pytest.mark.asyncio
+async def test_get_wan_ip_cached_until_ttl(monkeypatch):
+    monkeypatch.setattr(utils, "_wan_ip_cache", None)
+    clock = [1000.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    answer = ["203.0.113.7\n"]
+    requests = _mock_wan_services(
+        monkeypatch, lambda request: httpx.Response(200, text=answer[0])
+    )
+
+    assert await utils.get_wan_ip() == "203.0.113.7"
+    sent = len(requests)
+    assert await utils.get_wan_ip() == "203.0.113.7"
+    assert len(requests) == sent
+
+    clock[0] += utils._WAN_TTL_S + 1
+    answer[0] = "203.0.113.8"
+    assert await utils.get_wan_ip() == "203.0.113.8"
+    assert len(requests) > sent
+
+
+@pytest.mark.asyncio
+async def test_get_wan_ip_serves_last_good_value_during_outage(monkeypatch):
+    clock = [5000.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(
+        utils, "_wan_ip_cache", ("203.0.113.7", clock[0] + utils._WAN_TTL_S)
+    )
+    _mock_wan_services(monkeypatch, lambda request: httpx.Response(503))
+
+    clock[0] += utils._WAN_TTL_S + 1
+    assert await utils.get_wan_ip() == "203.0.113.7"
+
+    clock[0] += utils._WAN_STALE_S
+    assert await utils.get_wan_ip() == "n/a"
+
+
+@pytest.mark.asyncio
+async def test_close_http_client_resets_shared_client(monkeypatch):
+    monkeypatch.setattr(utils, "_HTTP_CLIENT", None)
+    client = utils._get_http_client()
+    assert utils._get_http_client() is client
+
+    await utils.close_http_client()
+
+    assert client.is_closed
+    assert utils._HTTP_CLIENT is None
+    await utils.close_http_client()
 
 
 @pytest.mark.asyncio
-async def test_speedtest_curl_missing():
-    with patch("shutil.which", return_value=None):
-        result = await utils.speedtest_download()
-        assert "curl not available" in result
+async def test_container_stats_rich_samples_containers_concurrently(monkeypatch):
+    monkeypatch.setattr(utils, "_STATS_CACHE", [])
+    barrier = threading.Barrier(3, timeout=2)
+
+    def _stats(container_id, stream, **_kwargs):
+        barrier.wait()
+        if container_id == "b":
+            raise RuntimeError("gone")
+        return {"pids_stats": {"current": 1}}
+
+    fake_client = Mock()
+    fake_client.api.containers.return_value = [
+        {"Id": cid, "Names": [f"/{cid}"]} for cid in ("a", "b", "c")
+    ]
+    fake_client.api.stats.side_effect = _stats
+
+    with patch("tele_home_supervisor.utils.client", fake_client):
+        stats = await utils.container_stats_rich()
+
+    # All three stats calls had to be in flight at once to pass the barrier;
+    # failures are dropped and order follows the container listing.
+    assert [row["name"] for row in stats] == ["a", "c"]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import socket
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
 
 from tele_home_supervisor import utils
@@ -11,11 +13,10 @@ from tele_home_supervisor import utils
 
 @pytest.mark.asyncio
 async def test_get_primary_ip_falls_back_to_psutil(monkeypatch):
-    monkeypatch.setattr(
-        utils.cli,
-        "run_cmd",
-        AsyncMock(return_value=(1, "", "no route")),
-    )
+    def _no_route():
+        raise OSError("Network is unreachable")
+
+    monkeypatch.setattr(utils, "_route_source_ip", _no_route)
     monkeypatch.setattr(
         utils.psutil,
         "net_if_addrs",
@@ -35,6 +36,7 @@ async def test_host_health_collects_expected_fields(monkeypatch):
     monkeypatch.setattr(utils, "get_temp", AsyncMock(return_value="45C"))
     monkeypatch.setattr(utils, "human_uptime", lambda: "1 day")
     monkeypatch.setattr(utils.os, "getloadavg", lambda: (1.0, 2.0, 3.0))
+    monkeypatch.setattr(utils, "_LAST_CPU_TS", float("-inf"))
     monkeypatch.setattr(utils.psutil, "cpu_percent", lambda interval=0.2: 12.3)
     monkeypatch.setattr(
         utils.psutil,
@@ -56,41 +58,142 @@ async def test_host_health_collects_expected_fields(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_container_helpers_with_fake_client():
+async def test_temperature_reads_use_paths_probed_at_import(monkeypatch, tmp_path):
+    zone = tmp_path / "temp"
+    zone.write_text("48250\n")
+    monkeypatch.setattr(utils, "_TEMP_PATHS", (str(zone),))
+    monkeypatch.setattr(utils, "_CPU_TEMP_PATHS", (str(zone),))
+    monkeypatch.setattr(utils, "_which", lambda name: None)
+
+    assert await utils.get_temp() == "48.2°C"
+    assert await utils.get_cpu_temp() == "CPU Temp: 48.2°C"
+
+    monkeypatch.setattr(utils, "_TEMP_PATHS", ())
+    assert await utils.get_temp() == "n/a"
+
+
+@pytest.mark.asyncio
+async def test_get_temp_falls_back_to_vcgencmd(monkeypatch):
+    calls = []
+
+    async def _run_cmd(cmd, timeout=10):
+        calls.append(cmd)
+        return 0, "temp=51.0'C\n", ""
+
+    monkeypatch.setattr(utils, "_TEMP_PATHS", ())
+    monkeypatch.setattr(utils, "_which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(utils.cli, "run_cmd", _run_cmd)
+
+    assert await utils.get_temp() == "temp=51.0'C"
+    assert calls == [["/usr/bin/vcgencmd", "measure_temp"]]
+
+
+def test_local_time_str_is_formatted_once_per_second(monkeypatch):
+    clock = [1_700_000_000.2]
+    monkeypatch.setattr(utils.time, "time", lambda: clock[0])
+    monkeypatch.setattr(utils, "_last_time_str", (0, ""))
+
+    first = utils._local_time_str()
+    monkeypatch.setattr(utils, "_last_time_str", (1_700_000_000, "cached"))
+    clock[0] = 1_700_000_000.9
+    assert utils._local_time_str() == "cached"
+    clock[0] = 1_700_000_001.0
+    assert utils._local_time_str() not in ("cached", first)
+
+
+def test_human_uptime_uses_cached_boot_time(monkeypatch):
+    monkeypatch.setattr(utils, "_BOOT_TIME", 1_000.0)
+    monkeypatch.setattr(utils.time, "time", lambda: 1_000.0 + 90_061)
+    monkeypatch.setattr(
+        utils.psutil, "boot_time", Mock(side_effect=AssertionError("re-read"))
+    )
+
+    assert utils.human_uptime() == "1d 1h 1m"
+
+
+def test_cpu_percent_samples_when_stale_and_reuses_fresh_readings(monkeypatch):
+    calls = []
+
+    def _cpu_percent(interval=0.2):
+        calls.append(interval)
+        return 30.0 + len(calls)
+
+    clock = [100.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(utils.psutil, "cpu_percent", _cpu_percent)
+    monkeypatch.setattr(utils, "_LAST_CPU_TS", float("-inf"))
+
+    assert utils._cpu_percent() == 31.0
+    clock[0] += 0.1
+    assert utils._cpu_percent() == 31.0
+    clock[0] += utils._CPU_MIN_INTERVAL_S
+    assert utils._cpu_percent() == 32.0
+    clock[0] += utils._CPU_STALE_S
+    assert utils._cpu_percent() == 33.0
+    assert calls == [utils._CPU_SAMPLE_S, None, utils._CPU_SAMPLE_S]
+
+
+@pytest.mark.asyncio
+async def test_container_helpers_with_fake_client(monkeypatch):
+    monkeypatch.setattr(utils, "_containers_cache", (0.0, []))
     container = Mock()
-    container.name = "app"
-    container.image.tags = ["app:latest"]
-    container.image.short_id = "sha256:abc"
-    container.status = "running"
     container.attrs = {
         "NetworkSettings": {"Ports": {"80/tcp": [{"HostPort": "8080"}]}},
         "State": {"Health": {"Status": "healthy"}},
     }
     container.logs.return_value = b"line1\nline2\nline3"
     client = Mock()
-    client.containers.list.return_value = [container]
+    client.api.containers.return_value = [
+        {
+            "Id": "c1",
+            "Names": ["/app"],
+            "Image": "app:latest",
+            "State": "running",
+            "Ports": [
+                {
+                    "IP": "192.168.1.5",
+                    "PrivatePort": 80,
+                    "PublicPort": 8080,
+                    "Type": "tcp",
+                },
+                {"PrivatePort": 9000, "Type": "udp"},
+            ],
+        },
+        {"Id": "c2", "Names": ["/old"], "Image": "sha256:" + "f" * 64},
+    ]
     client.containers.get.return_value = container
 
     with patch("tele_home_supervisor.utils.client", client):
-        assert await utils.list_container_names() == {"app"}
+        assert await utils.list_container_names() == {"app", "old"}
         basic = await utils.list_containers_basic()
-        assert basic[0]["ports"] == "8080->80/tcp"
+        assert basic[0] == {
+            "name": "app",
+            "image": "app:latest",
+            "status": "running",
+            "ports": "8080->80/tcp, 9000/udp",
+        }
+        assert basic[1] == {"name": "old", "error": True}
+        # Both helpers within the TTL share one Docker API round trip.
+        assert client.api.containers.call_count == 1
+        client.containers.list.assert_not_called()
         assert await utils.get_container_logs("app", lines=2) == "line1\nline2\nline3"
         assert (
             await utils.get_container_logs_full("app", since=123)
             == "line1\nline2\nline3"
         )
         assert await utils.healthcheck_container("app") == "Health: healthy"
+        container.reload.assert_not_called()
         assert await utils.get_container_inspect("app") == container.attrs
 
 
 @pytest.mark.asyncio
 async def test_command_helpers_and_version(monkeypatch):
-    monkeypatch.setattr(utils.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(utils, "_which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(utils, "_icmp_ping_sync", lambda host, count: None)
+    monkeypatch.setattr(utils, "_git_info", None)
     run = AsyncMock(
         side_effect=[
             (0, "ping output", ""),
-            (0, "USER PID\nroot 1\napp 2\n", ""),
             (0, "LISTEN 0 1", ""),
             (0, "2026-01-01 00:00:00", ""),
             (0, "abc123", ""),
@@ -100,14 +203,163 @@ async def test_command_helpers_and_version(monkeypatch):
     monkeypatch.setattr(utils.cli, "run_cmd", run)
 
     assert await utils.ping_host("host", 2) == "ping output"
-    assert "root 1" in await utils.get_top_processes()
     assert await utils.get_listening_ports() == "LISTEN 0 1"
     version = await utils.get_version_info()
     assert version["last_commit"] == "2026-01-01 00:00:00"
     assert version["commit_hash"] == "abc123"
+    # The git lookups are resolved once and then served from memory.
+    assert (await utils.get_version_info())["commit_hash"] == "abc123"
     assert await utils.traceroute_host("host", 4) == "trace err"
 
 
+@pytest.mark.asyncio
+async def test_git_version_info_is_not_cached_after_failure(monkeypatch):
+    monkeypatch.setattr(utils, "_git_info", None)
+    run = AsyncMock(
+        side_effect=[
+            (124, "", "timed out"),
+            (0, "abc123", ""),
+            (0, "2026-01-01 00:00:00", ""),
+            (0, "abc123", ""),
+        ]
+    )
+    monkeypatch.setattr(utils.cli, "run_cmd", run)
+
+    first = await utils._git_version_info()
+    assert first == {"last_commit": "", "commit_hash": "abc123"}
+    second = await utils._git_version_info()
+    assert second["last_commit"] == "2026-01-01 00:00:00"
+    assert await utils._git_version_info() is second
+    assert run.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_get_top_processes_ranks_by_lifetime_cpu(monkeypatch):
+    now = 10_000.0
+    monkeypatch.setattr(utils.time, "time", lambda: now)
+
+    def _proc(pid, user, cpu_seconds, age, mem, name):
+        return SimpleNamespace(
+            info={
+                "pid": pid,
+                "username": user,
+                "cpu_times": SimpleNamespace(user=cpu_seconds, system=0.0),
+                "create_time": now - age,
+                "memory_percent": mem,
+                "name": name,
+            }
+        )
+
+    procs = [
+        _proc(1, "root", 1.0, 1000.0, 0.1, "init"),
+        _proc(42, "app", 50.0, 100.0, 12.5, "python"),
+        _proc(7, None, 0.0, 0.0, None, None),
+    ]
+    monkeypatch.setattr(utils.psutil, "process_iter", lambda attrs: iter(procs))
+
+    lines = (await utils.get_top_processes()).splitlines()
+
+    assert lines[0].split() == ["USER", "PID", "%CPU", "%MEM", "COMMAND"]
+    assert lines[1].split() == ["app", "42", "50.0", "12.5", "python"]
+    assert lines[2].split() == ["root", "1", "0.1", "0.1", "init"]
+    assert lines[3].split() == ["?", "7", "0.0", "0.0", "?"]
+
+
+@pytest.mark.asyncio
+async def test_get_container_logs_head_stops_streaming_early():
+    pulled: list[bytes] = []
+    closed: list[bool] = []
+
+    class _Stream:
+        def __iter__(self):
+            for chunk in (b"\nfirst\nsec", b"ond\nthird\n", b"fourth\n"):
+                pulled.append(chunk)
+                yield chunk
+
+        def close(self):
+            closed.append(True)
+
+    container = Mock()
+    container.logs.return_value = _Stream()
+    client = Mock()
+    client.containers.get.return_value = container
+
+    with patch("tele_home_supervisor.utils.client", client):
+        out = await utils.get_container_logs("app", lines=-2)
+
+    assert out == "first\nsecond"
+    assert len(pulled) == 2
+    assert closed == [True]
+    container.logs.assert_called_once_with(
+        stdout=True, stderr=True, stream=True, follow=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_container_logs_head_returns_short_log_without_following():
+    container = Mock()
+    container.logs.return_value = iter([b"\n\n", b"only\n", b"two\n"])
+    client = Mock()
+    client.containers.get.return_value = container
+
+    with patch("tele_home_supervisor.utils.client", client):
+        out = await utils.get_container_logs("app", lines=-5)
+
+    assert out == "only\ntwo"
+    kwargs = container.logs.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert kwargs["follow"] is False
+
+
+class _EchoSocket:
+    """ICMP datagram socket double that answers every echo request."""
+
+    def __init__(self, *_args):
+        self.sent: list[bytes] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def settimeout(self, _timeout):
+        pass
+
+    def sendto(self, packet, _addr):
+        self.sent.append(packet)
+
+    def recvfrom(self, _size):
+        request = self.sent[-1]
+        return b"\x00" + request[1:], ("10.0.0.9", 0)
+
+
+@pytest.mark.asyncio
+async def test_ping_host_uses_icmp_datagram_socket(monkeypatch):
+    sockets: list[_EchoSocket] = []
+
+    def _socket(*args):
+        sock = _EchoSocket(*args)
+        sockets.append(sock)
+        return sock
+
+    monkeypatch.setattr(utils.socket, "socket", _socket)
+    monkeypatch.setattr(
+        utils.socket,
+        "getaddrinfo",
+        lambda *_: [(socket.AF_INET, None, None, None, ("10.0.0.9", 0))],
+    )
+    run = AsyncMock()
+    monkeypatch.setattr(utils.cli, "run_cmd", run)
+
+    out = await utils.ping_host("nas", 2)
+
+    assert "icmp_seq=2" in out
+    assert "2 packets transmitted, 2 received, 0% packet loss" in out
+    assert utils._icmp_checksum(sockets[0].sent[0]) == 0
+    run.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_dns_lookup_disk_usage_and_speedtest_edges(monkeypatch):
     monkeypatch.setattr(
@@ -129,22 +381,10 @@ async def test_dns_lookup_disk_usage_and_speedtest_edges(monkeypatch):
         {"path": "/", "total": 100, "used": 40, "free": 60, "percent": 40.0}
     ]
 
-    monkeypatch.setattr(utils.shutil, "which", lambda name: "/usr/bin/curl")
-    monkeypatch.setattr(
-        utils.cli,
-        "run_cmd",
-        AsyncMock(
-            side_effect=[
-                (1, "", "fail"),
-                (0, "bad output", ""),
-                (0, "TIME:0 SIZE:1", ""),
-            ]
-        ),
-    )
-    assert (await utils.speedtest_download(1)).startswith("Speedtest failed")
-    assert (
-        await utils.speedtest_download(1) == "Speedtest failed: invalid output format"
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200))
     )
+    monkeypatch.setattr(utils, "_get_http_client", lambda: client)
     assert await utils.speedtest_download(1) == "Invalid duration"
 
 
@@ -158,8 +398,84 @@ def test_split_telegram_message_long_lines_and_code_blocks():
     assert chunks[-1].endswith("end")
 
 
+@pytest.mark.asyncio
+async def test_dns_lookup_reports_resolver_errors(monkeypatch):
+    def _fail(*_args):
+        raise socket.gaierror(-2, "Name or service not known")
+
+    monkeypatch.setattr(utils.socket, "getaddrinfo", _fail)
+
+    assert await utils.dns_lookup("nope.invalid") == (
+        "Error: [Errno -2] Name or service not known"
+    )
+
+
+def test_fmt_bytes_unit_boundaries():
+    assert utils.fmt_bytes(0) == "0.0 B"
+    assert utils.fmt_bytes(1023) == "1023.0 B"
+    assert utils.fmt_bytes(1024) == "1.0 KiB"
+    assert utils.fmt_bytes(1536.0) == "1.5 KiB"
+    assert utils.fmt_bytes((1 << 20) - 1) == "1024.0 KiB"
+    assert utils.fmt_bytes(1 << 30) == "1.0 GiB"
+    assert utils.fmt_bytes(1 << 50) == "1024.0 TiB"
+
+
 def test_rate_formatting_and_port_formatting():
     assert utils._fmt_rate_kbits(500_000) == "500.00 Kb/s"
     assert utils._fmt_rate_kbits(2_000_000) == "2.00 Mb/s"
     assert utils._format_ports(None) == "-"
     assert utils._format_ports({"80/tcp": None}) == "80/tcp"
+
+
+@pytest.mark.asyncio
+async def test_host_health_runs_probes_concurrently(monkeypatch):
+    started: list[str] = []
+    release = asyncio.Event()
+
+    def _probe(name, value):
+        async def _run():
+            started.append(name)
+            if len(started) == 3:
+                release.set()
+            await asyncio.wait_for(release.wait(), timeout=1)
+            return value
+
+        return _run
+
+    monkeypatch.setattr(utils, "get_primary_ip", _probe("lan", "10.0.0.2"))
+    monkeypatch.setattr(utils, "get_wan_ip", _probe("wan", "1.2.3.4"))
+    monkeypatch.setattr(utils, "get_temp", _probe("temp", "40C"))
+    monkeypatch.setattr(utils.psutil, "cpu_percent", lambda interval=0.2: 5.0)
+    monkeypatch.setattr(
+        utils.psutil,
+        "virtual_memory",
+        lambda: SimpleNamespace(used=1, total=2, percent=50.0),
+    )
+
+    data = await utils.host_health([])
+
+    assert sorted(started) == ["lan", "temp", "wan"]
+    assert data["lan_ip"] == "10.0.0.2"
+    assert data["wan_ip"] == "1.2.3.4"
+    assert data["temp"] == "40C"
+
+
+@pytest.mark.asyncio
+async def test_host_health_degrades_failing_probes(monkeypatch):
+    monkeypatch.setattr(utils, "get_primary_ip", AsyncMock(return_value="10.0.0.2"))
+    monkeypatch.setattr(
+        utils, "get_wan_ip", AsyncMock(side_effect=RuntimeError("resolver down"))
+    )
+    monkeypatch.setattr(utils, "get_temp", AsyncMock(side_effect=OSError("sensor")))
+    monkeypatch.setattr(utils.psutil, "cpu_percent", lambda interval=0.2: 5.0)
+    monkeypatch.setattr(
+        utils.psutil,
+        "virtual_memory",
+        lambda: SimpleNamespace(used=1, total=2, percent=50.0),
+    )
+
+    data = await utils.host_health([])
+
+    assert data["lan_ip"] == "10.0.0.2"
+    assert data["wan_ip"] == "n/a"
+    assert data["temp"] == "n/a"